@@ -0,0 +1,124 @@
+# src/core/budget.py
+
+"""
+Wall-clock budget for a whole analyzer run.
+
+With a deadline (RUN_DEADLINE_SEC), per-test timeouts are derived from predicted costs
+instead of one fixed TEST_TIMEOUT_SEC. The predicted cost of a test on a sequence is its
+historical cost per reference-sized sequence (from TestStats) times cost_scale(), which
+grows with the number of terms and with big-integer terms. Each test is allowed its
+predicted cost times the current slack. The slack is the remaining worker time divided
+by the predicted cost of the remaining work. Plenty of time means generous timeouts,
+and a tight budget cuts them down, so one hard sequence cannot starve later ones.
+Timeouts are computed when a test starts, and never reach past the deadline.
+
+Candidates that no longer fit are deferred, as are tests that would only start after
+the deadline. Deferred candidates are written to a file that the next run reads, and
+that run analyzes them first.
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Iterable, List, Optional
+
+from core.scheduler import TestStats
+from core.sequence_view import SequenceView
+
+# Size of the "typical" b-file the per-test costs refer to.
+REFERENCE_TERMS = 1000
+# Extra cost factor when terms do not fit in int64 and arithmetic goes through Python ints.
+BIGINT_COST_FACTOR = 3.0
+# Every test gets at least this multiple of its predicted cost, and at least MIN_TIMEOUT_SEC
+# (unless that would pass the deadline).
+MIN_SLACK = 2.0
+MIN_TIMEOUT_SEC = 1.0
+
+
+def cost_scale(view: SequenceView) -> float:
+    """Predicted cost of testing `view` relative to a reference-sized int64 sequence."""
+    scale = max(len(view), 1) / REFERENCE_TERMS
+    return scale if view.is_int64 else scale * BIGINT_COST_FACTOR
+
+
+class RunBudget:
+    """Splits the time left until a deadline over the candidates and tests still to run."""
+
+    def __init__(self, deadline_sec: float, workers: int, candidates: int, stats: TestStats,
+                 max_timeout_sec: Optional[float] = None):
+        self.deadline = time.monotonic() + deadline_sec
+        self.workers = max(1, workers)
+        self.remaining_candidates = candidates
+        self.stats = stats
+        self.max_timeout_sec = max_timeout_sec
+        # Left unallocated so in-flight tests, reporting and the summary finish in time.
+        self.reserve_sec = min(120.0, 0.05 * deadline_sec)
+        self._seen_cost = 0.0
+        self._seen = 0
+
+    def time_left(self) -> float:
+        return self.deadline - time.monotonic() - self.reserve_sec
+
+    def predict(self, label: str, view: SequenceView) -> float:
+        return self.stats.expected_cost(label) * cost_scale(view)
+
+    def exhausted(self) -> bool:
+        return self.time_left() <= 0
+
+    def admit(self, view: SequenceView, labels: Iterable[str]) -> bool:
+        """
+        Accounts for the next candidate; False if it should be deferred.
+
+        A candidate is deferred when even at its predicted speed it could not finish in
+        the worker time that is left.
+        """
+        cost = sum(self.predict(label, view) for label in labels)
+        self.remaining_candidates = max(0, self.remaining_candidates - 1)
+        self._seen_cost += cost
+        self._seen += 1
+        return cost <= self.time_left() * self.workers
+
+    def timeout_for(self, label: str, view: SequenceView) -> float:
+        """
+        Per-test timeout: the predicted cost times the current slack, clamped to the time left.
+
+        Returns 0 once the deadline has passed, which makes the sandbox defer the test.
+        """
+        left = self.time_left()
+        if left <= 0:
+            return 0.0
+        mean_cost = self._seen_cost / self._seen if self._seen else 0.0
+        demand = mean_cost * (self.remaining_candidates + 1)
+        slack = left * self.workers / demand if demand > 0 else float("inf")
+        timeout = max(self.predict(label, view) * max(slack, MIN_SLACK), MIN_TIMEOUT_SEC)
+        if self.max_timeout_sec:
+            timeout = min(timeout, self.max_timeout_sec)
+        return min(timeout, left)
+
+
+def load_deferred(path: str) -> List[str]:
+    """Candidates deferred by the previous run, oldest first; empty if there are none."""
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return [oeis_id for oeis_id in json.load(f) if isinstance(oeis_id, str)]
+    except Exception as e:
+        logging.warning("Could not read deferred candidates from %s: %s", path, e)
+        return []
+
+
+def save_deferred(path: str, oeis_ids: List[str]) -> None:
+    """Writes the deferred candidates, or removes the file when there are none."""
+    try:
+        if not oeis_ids:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(oeis_ids, f, indent=2)
+        logging.info("Deferred %d candidates to the next run (%s).", len(oeis_ids), path)
+    except Exception as e:
+        logging.error("Could not save deferred candidates to %s: %s", path, e)
@@ -0,0 +1,98 @@
+# src/core/checkpoint.py
+
+"""
+Append-only checkpoint journal of completed candidates.
+
+The analyzer appends one JSON line per reported candidate, flushed immediately, so a
+run killed by the job timeout loses at most the candidates that were still in flight.
+The next run loads the journal into a dict (O(1) membership per candidate), replays
+the journaled results into its metrics and analyzes only what is left. The journal
+is removed once a run completes.
+
+The first line is a header with a run key (shard, engine version, test plan). A journal
+with a different key belongs to a different kind of run and is discarded.
+"""
+
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, TextIO
+
+
+class CheckpointJournal:
+    """Completed candidates of one run configuration, backed by a JSONL file."""
+
+    def __init__(self, path: str, run_key: str):
+        self.path = path
+        self.run_key = run_key
+        self.completed: Dict[str, Dict[str, Any]] = {}
+        self._file: Optional[TextIO] = None
+        self._load()
+
+    def __contains__(self, oeis_id: str) -> bool:
+        return oeis_id in self.completed
+
+    def __len__(self) -> int:
+        return len(self.completed)
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except OSError as e:
+            logging.warning("Could not read checkpoint journal %s: %s", self.path, e)
+            return
+        header = _parse(lines[0]) if lines else None
+        if not header or header.get("run_key") != self.run_key:
+            logging.info("Discarding checkpoint journal %s from a different run configuration.", self.path)
+            os.remove(self.path)
+            return
+        for line in lines[1:]:
+            record = _parse(line)
+            # The last line can be torn if the process was killed mid-write.
+            if record and "oeis_id" in record:
+                self.completed[record["oeis_id"]] = record
+        logging.info("Resuming from checkpoint journal %s: %d candidates already done.",
+                     self.path, len(self.completed))
+
+    def records(self, oeis_ids: List[str]) -> List[Dict[str, Any]]:
+        """Journaled records for the given IDs, in that order."""
+        return [self.completed[oeis_id] for oeis_id in oeis_ids if oeis_id in self.completed]
+
+    def append(self, record: Dict[str, Any]) -> None:
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            fresh = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+            self._file = open(self.path, "a", encoding="utf-8")
+            if fresh:
+                self._write({"run_key": self.run_key})
+            else:
+                # Terminate a torn last line so the next record starts cleanly.
+                self._file.write("\n")
+        self._write(record)
+        self.completed[record["oeis_id"]] = record
+
+    def _write(self, obj: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(obj, default=str) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def complete(self) -> None:
+        """Closes and deletes the journal after a finished run."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _parse(line: str) -> Optional[Dict[str, Any]]:
+    try:
+        obj = json.loads(line)
+    except ValueError:
+        return None
+    return obj if isinstance(obj, dict) else None
@@ -1,12 +1,30 @@
 # src/core/conjecture_engine.py
 
+import math
 import numpy as np
 import sympy
 import yaml
 import logging
-from scipy.linalg import solve, LinAlgError
-from scipy.optimize import fsolve
-from typing import List, Dict, Any
+from fractions import Fraction
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+from core.linalg import (
+    length_buckets,
+    minimal_recurrence,
+    minimal_recurrences,
+    nullspace_vector,
+    primes,
+    rank_mod,
+    rational_generating_function,
+    solve_exact,
+)
+from core.sequence_view import SequenceLike, SequenceView
+from core.verification import (
+    scale_to_integers,
+    verify_exponential_sum,
+    verify_holonomic_recurrence,
+    verify_linear_recurrence,
+)
 
 # --- Configuration Loading ---
 def load_config() -> Dict:
@@ -18,12 +36,22 @@ def load_config() -> Dict:
         logging.error("Configuration file 'config/settings.yaml' not found.")
         return {
             'max_poly_degree_to_test': 15,
-            'max_recurrence_depth_to_test': 15,
+            'max_recurrence_depth_to_test': 100,
+            'max_holonomic_order': 10,
+            'max_holonomic_degree': 10,
+            'max_gf_degree': 200,
+            'max_exponential_terms': 3,
+            'max_exponential_base': 100,
             'verification_ratio': 0.8
         }
 
 CONFIG = load_config()
 
+# Extra terms a recurrence must explain beyond the 2k terms that determine it.
+RECURRENCE_MARGIN = 4
+# Extra equations beyond the number of unknowns in a holonomic ansatz.
+HOLONOMIC_MARGIN = 8
+
 # --- Logging Setup ---
 if not logging.getLogger().hasHandlers():
     logging.basicConfig(
@@ -34,109 +62,424 @@ if not logging.getLogger().hasHandlers():
 
 # --- Conjecture Functions ---
 
-def test_polynomial_conjecture(sequence_data: List[int]) -> Dict[str, Any]:
-    """Tests if a sequence can be described by a simple polynomial formula."""
-    n = sympy.symbols('n')
+def _minimal_difference_degree(view: SequenceView, max_degree: int) -> Tuple[Optional[int], List[int]]:
+    """
+    Walks the Newton forward-difference table of the sequence in one pass.
+
+    Returns the smallest degree d <= max_degree whose d-th differences are constant
+    over all terms (None if there is none), together with the leading differences
+    Δ^0 a(1), ..., Δ^d a(1) that define the Newton form of the polynomial.
+    """
+    leading = []
+    for k in range(max_degree + 1):
+        row = view.difference(k)
+        if len(row) < 2:
+            break
+        leading.append(int(row[0]))
+        if bool(np.all(row == row[0])):
+            return k, leading
+    return None, leading
+
+
+def _newton_to_monomial(leading: List[int]) -> List[Fraction]:
+    """
+    Converts a(n) = Σ_k Δ^k a(1) · C(n-1, k) into monomial coefficients, lowest power first.
+    """
+    coeffs = [Fraction(0)] * len(leading)
+    basis = [Fraction(1)]  # C(n-1, k) as a polynomial in n, lowest power first
+    for k, delta in enumerate(leading):
+        for i, b in enumerate(basis):
+            coeffs[i] += delta * b
+        # C(n-1, k+1) = C(n-1, k) * (n - 1 - k) / (k + 1)
+        shifted = [Fraction(0)] + basis
+        for i, b in enumerate(basis):
+            shifted[i] -= (k + 1) * b
+        basis = [b / (k + 1) for b in shifted]
+    return coeffs
+
+
+def test_polynomial_conjecture(sequence_data: SequenceLike) -> Dict[str, Any]:
+    """
+    Tests if a sequence can be described by a polynomial formula with rational coefficients.
+
+    Uses the exact forward-difference table: a polynomial of degree d is the only kind of
+    sequence whose d-th differences are constant, so the minimal degree and its Newton
+    coefficients fall out of a single O(n·d) pass over arbitrary-size integers.
+    """
+    sequence_data = SequenceView.of(sequence_data)
     max_degree = CONFIG.get('max_poly_degree_to_test', 15)
     verification_ratio = CONFIG.get('verification_ratio', 0.8)
-    
+
     fit_len = int(len(sequence_data) * verification_ratio)
     if fit_len < 2:
         return {"status": "failed"}
 
-    x_fit = np.arange(1, fit_len + 1)
-    
-    try:
-        # Attempt to cast the relevant part of the sequence to a fixed-size integer array.
-        # This preemptively catches numbers that are too large for numpy's C-based routines.
-        y_fit = np.array(sequence_data[:fit_len], dtype=np.int64)
-    except OverflowError:
-        logging.warning("Sequence contains numbers too large for polynomial fitting. Skipping.")
+    # The polynomial must be determined by the fitting portion of the sequence,
+    # leaving the remaining terms as genuine verification points.
+    degree, leading = _minimal_difference_degree(sequence_data, min(max_degree, fit_len - 1))
+    if degree is None:
         return {"status": "failed"}
+    return _polynomial_result(degree, leading[:degree + 1])
 
-    for degree in range(1, max_degree + 1):
-        if fit_len <= degree: continue
-        try:
-            coeffs = np.polyfit(x_fit, y_fit, degree)
-        except np.linalg.LinAlgError:
-            continue
-        if not all(abs(c - round(c)) < 1e-9 for c in coeffs): continue
-        rounded_coeffs = [int(round(c)) for c in coeffs]
-        poly_formula = sum(c * n**(degree - i) for i, c in enumerate(rounded_coeffs))
-        is_verified = all(poly_formula.subs(n, i) == true_val for i, true_val in enumerate(sequence_data, 1))
-        if is_verified:
-            return {"status": "verified", "type": "polynomial", "formula_latex": str(sympy.latex(poly_formula)), "details": f"Polynomial of degree {degree}"}
-            
-    return {"status": "failed"}
 
+def _polynomial_result(degree: int, leading: List[int]) -> Dict[str, Any]:
+    n = sympy.symbols('n')
+    coeffs = _newton_to_monomial(leading)
+    poly_formula = sum(sympy.Rational(c.numerator, c.denominator) * n**i for i, c in enumerate(coeffs))
+    return {"status": "verified", "type": "polynomial", "formula_latex": str(sympy.latex(poly_formula)), "details": f"Polynomial of degree {degree}"}
 
-def test_linear_recurrence_conjecture(sequence_data: List[int]) -> Dict[str, Any]:
-    """Tests if a sequence satisfies a linear recurrence relation."""
-    # Preemptively check if sequence values are too large for numpy's standard integer types.
-    # This is more robust than checking for 'object' dtype later on.
-    try:
-        _ = np.array(sequence_data, dtype=np.int64)
-    except OverflowError:
-        logging.warning("Sequence contains numbers too large for recurrence solver. Skipping.")
+
+def _minimal_difference_degrees(block: np.ndarray, lengths: np.ndarray,
+                                max_degrees: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    _minimal_difference_degree() for every row of an int64 (B, n) block at once.
+
+    Row i holds lengths[i] terms (the rest is padding, which is never compared) and is
+    searched up to degree max_degrees[i]. Returns the minimal degrees (-1 where there is
+    none) and the leading differences, shape (B, max(max_degrees) + 1). The caller
+    ensures the differences cannot leave int64.
+    """
+    top = int(max_degrees.max(initial=-1))
+    degrees = np.full(block.shape[0], -1, dtype=np.int64)
+    leading = np.zeros((block.shape[0], top + 1), dtype=np.int64)
+    columns = np.arange(block.shape[1])[None, :]
+    row = block
+    for k in range(top + 1):
+        valid = lengths - k
+        open_rows = (degrees < 0) & (k <= max_degrees) & (valid >= 2)
+        if not open_rows.any():
+            break
+        leading[:, k] = row[:, 0]
+        constant = np.all((row == row[:, :1]) | (columns[:, :row.shape[1]] >= valid[:, None]), axis=1)
+        degrees[open_rows & constant] = k
+        row = np.diff(row, axis=1)
+    return degrees, leading
+
+
+def test_polynomial_conjecture_batch(sequences: Sequence[SequenceLike]) -> List[Dict[str, Any]]:
+    """
+    test_polynomial_conjecture() for many sequences, with the same results in input order.
+
+    Sequences of similar length (see length_buckets()) are stacked into one 2-D array,
+    zero-padded to the longest, and differenced together, so the table costs one NumPy
+    call per degree for the whole group; each row is only compared over its own terms.
+    Sequences whose differences could overflow int64 go through the single-sequence test.
+    """
+    views = [SequenceView.of(s) for s in sequences]
+    max_degree = CONFIG.get('max_poly_degree_to_test', 15)
+    verification_ratio = CONFIG.get('verification_ratio', 0.8)
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(views)
+    stacked: List[int] = []
+    for i, view in enumerate(views):
+        fit_len = int(len(view) * verification_ratio)
+        # |Δ^k a| <= 2^k max|a| (padding is 0), so this bound keeps the table in int64.
+        if fit_len >= 2 and view.is_int64 and view.max_abs.bit_length() + min(max_degree, fit_len - 1) <= 62:
+            stacked.append(i)
+        else:
+            results[i] = test_polynomial_conjecture(view)
+
+    for bucket in length_buckets([len(views[i]) for i in stacked]):
+        members = [stacked[j] for j in bucket]
+        lengths = np.array([len(views[i]) for i in members], dtype=np.int64)
+        block = np.zeros((len(members), int(lengths.max())), dtype=np.int64)
+        for row, i in enumerate(members):
+            block[row, :lengths[row]] = views[i].array
+        caps = np.minimum(max_degree, (lengths * verification_ratio).astype(np.int64) - 1)
+        degrees, leading = _minimal_difference_degrees(block, lengths, caps)
+        for i, degree, lead in zip(members, degrees, leading):
+            degree = int(degree)
+            results[i] = _polynomial_result(degree, [int(d) for d in lead[:degree + 1]]) if degree >= 0 else {"status": "failed"}
+    return results
+
+
+def test_linear_recurrence_conjecture(sequence_data: SequenceLike) -> Dict[str, Any]:
+    """
+    Tests if a sequence satisfies a linear recurrence relation with integer coefficients.
+
+    The minimal recurrence is found in one Berlekamp-Massey pass over the first
+    2 * max_depth + RECURRENCE_MARGIN terms (modulo several primes, lifted back to the
+    rationals) and then checked against the whole sequence.
+    """
+    sequence_data = SequenceView.of(sequence_data)
+    max_depth = CONFIG.get('max_recurrence_depth_to_test', 100)
+
+    coeffs = minimal_recurrence(sequence_data, length=2 * max_depth + RECURRENCE_MARGIN)
+    return _linear_recurrence_result(sequence_data, coeffs, max_depth)
+
+
+def _linear_recurrence_result(sequence_data: SequenceView, coeffs: Optional[List[Fraction]], max_depth: int) -> Dict[str, Any]:
+    """Checks a candidate minimal recurrence against the whole sequence."""
+    if coeffs is None:
+        return {"status": "failed"}
+    k = len(coeffs)
+    # A recurrence of order k is always determined by 2k terms; insist on extra
+    # terms beyond that so the fit is not trivially satisfied.
+    if k == 0 or k > max_depth or len(sequence_data) < 2 * k + RECURRENCE_MARGIN:
+        return {"status": "failed"}
+    # By Fatou's lemma the minimal recurrence of an integer sequence has integer coefficients.
+    if any(c.denominator != 1 for c in coeffs):
         return {"status": "failed"}
 
-    max_depth = CONFIG.get('max_recurrence_depth_to_test', 15)
-    for k in range(1, max_depth + 1):
-        if len(sequence_data) < 2 * k: continue
-        
-        A_list, b_list = [], []
-        for i in range(k, 2 * k):
-            A_list.append(list(reversed(sequence_data[i-k:i])))
-            b_list.append(sequence_data[i])
-        
-        A = np.array(A_list)
-        b = np.array(b_list)
-
-        try:
-            coeffs = solve(A, b)
-        except LinAlgError:
-            continue
-        if not np.all(np.isfinite(coeffs)): continue
-        if not all(abs(c - round(c)) < 1e-9 for c in coeffs): continue
-        rounded_coeffs = [int(round(c)) for c in coeffs]
-        is_verified = all(int(round(sum(c * sequence_data[i-j-1] for j, c in enumerate(rounded_coeffs)))) == sequence_data[i] for i in range(k, len(sequence_data)))
-        if is_verified:
-            terms = " + ".join(f"{c} \\cdot a(n-{j+1})" for j, c in enumerate(rounded_coeffs) if c != 0)
-            formula_latex = f"a(n) = {terms}".replace('+ -', '- ')
-            return {"status": "verified", "type": "linear_recurrence", "formula_latex": formula_latex, "details": f"Linear recurrence of depth {k}"}
+    int_coeffs = [int(c) for c in coeffs]
+    if verify_linear_recurrence(int_coeffs, sequence_data):
+        terms = " + ".join(f"{c} \\cdot a(n-{j+1})" for j, c in enumerate(int_coeffs) if c != 0)
+        formula_latex = f"a(n) = {terms}".replace('+ -', '- ')
+        return {"status": "verified", "type": "linear_recurrence", "formula_latex": formula_latex, "details": f"Linear recurrence of depth {k}"}
     return {"status": "failed"}
 
-def test_exponential_conjecture(sequence_data: List[int]) -> Dict[str, Any]:
-    """Tests for a formula like a(n) = A * B^n + C."""
-    if len(sequence_data) < 5:
+
+def test_linear_recurrence_conjecture_batch(sequences: Sequence[SequenceLike]) -> List[Dict[str, Any]]:
+    """
+    test_linear_recurrence_conjecture() for many sequences, with the same results in input order.
+
+    The Berlekamp-Massey passes of all sequences run as one batched call (rows are
+    sequence/prime pairs); only the final exact check is done per sequence.
+    """
+    views = [SequenceView.of(s) for s in sequences]
+    max_depth = CONFIG.get('max_recurrence_depth_to_test', 100)
+    all_coeffs = minimal_recurrences(views, length=2 * max_depth + RECURRENCE_MARGIN)
+    return [_linear_recurrence_result(view, coeffs, max_depth) for view, coeffs in zip(views, all_coeffs)]
+
+def test_rational_gf_conjecture(sequence_data: SequenceLike) -> Dict[str, Any]:
+    """
+    Tests if the generating function Σ a(n) x^(n-1) is rational, P(x)/Q(x).
+
+    Q comes from a Padé approximant over the first 2 * max_gf_degree + RECURRENCE_MARGIN
+    terms, computed with the extended Euclidean algorithm modulo several primes. P is
+    then exact from the initial terms, so any pre-period is absorbed into the numerator.
+    """
+    sequence_data = SequenceView.of(sequence_data)
+    max_degree = CONFIG.get('max_gf_degree', 200)
+    prefix_len = min(len(sequence_data), 2 * max_degree + RECURRENCE_MARGIN)
+
+    denominator = rational_generating_function(sequence_data, length=prefix_len)
+    if denominator is None or len(denominator) < 2:
+        return {"status": "failed"}
+    # By Fatou's lemma an integer series with a rational generating function has an
+    # integer denominator with constant term 1.
+    if any(c.denominator != 1 for c in denominator):
+        return {"status": "failed"}
+    q = [int(c) for c in denominator]
+    while q[-1] == 0:
+        q.pop()
+    q_deg = len(q) - 1
+    if q_deg == 0:
         return {"status": "failed"}
 
-    points = sequence_data[:3]
-    
-    def equations(p):
-        A, B, C = p
-        return (A * B**1 + C - points[0], A * B**2 + C - points[1], A * B**3 + C - points[2])
+    # The numerator is Q·S truncated where the recurrence takes over; the length of the
+    # shortest prefix it explains mirrors the Berlekamp-Massey order.
+    coeffs = [-c for c in q[1:]]
+    numerator = [sum(q[j] * sequence_data[i - j] for j in range(min(i, q_deg) + 1)) for i in range(prefix_len)]
+    while numerator and numerator[-1] == 0:
+        numerator.pop()
+    p_deg = len(numerator) - 1
+    order = max(q_deg, p_deg + 1)
+    if order > max_degree or len(sequence_data) < 2 * order + RECURRENCE_MARGIN:
+        return {"status": "failed"}
+    if not verify_linear_recurrence(coeffs, sequence_data, start_index=order):
+        return {"status": "failed"}
 
-    try:
-        initial_guess = (1.0, 2.0, 0.0)
-        coeffs, _, ier, _ = fsolve(equations, initial_guess, full_output=True)
-        if ier != 1: return {"status": "failed"}
-    except (ValueError, TypeError):
+    x = sympy.symbols('x')
+    P = sum(c * x**i for i, c in enumerate(numerator))
+    Q = sum(c * x**i for i, c in enumerate(q))
+    formula_latex = f"\\sum_{{n \\geq 1}} a(n) x^{{n-1}} = {sympy.latex(P / Q)}"
+    return {"status": "verified", "type": "rational_generating_function", "formula_latex": formula_latex,
+            "details": f"Rational generating function with denominator degree {q_deg} and numerator degree {p_deg}"}
+
+def _single_exponential(sequence_data: SequenceView) -> Optional[Tuple[Fraction, int, Fraction]]:
+    """
+    Derives (A, B, C) of a(n) = A·B^n + C from the ratio of the first two differences.
+
+    a(n+1) - a(n) = A·B^n·(B - 1), so consecutive differences have the constant ratio B.
+    """
+    diffs = sequence_data.difference(1)
+    d1, d2 = int(diffs[0]), int(diffs[1])
+    if d1 == 0 or d2 % d1 != 0:
+        return None
+    B = d2 // d1
+    if B in (0, 1):
+        return None
+    A = Fraction(d1, B * (B - 1))
+    C = sequence_data[0] - A * B
+    return A, B, C
+
+
+def _exponential_sum(sequence_data: SequenceView, max_terms: int, max_base: int) -> Optional[Tuple[List[Tuple[Fraction, int]], Fraction]]:
+    """
+    Finds a(n) = Σ A_i·B_i^n + C with distinct small integer bases B_i.
+
+    Such a sequence satisfies the linear recurrence whose characteristic polynomial is
+    Π (x - B_i), times (x - 1) when C != 0. The minimal recurrence is split into integer
+    roots and the amplitudes come from the exact Vandermonde solve.
+    """
+    coeffs = minimal_recurrence(sequence_data, length=2 * (max_terms + 1) + RECURRENCE_MARGIN)
+    if not coeffs or len(coeffs) > max_terms + 1 or any(c.denominator != 1 for c in coeffs):
+        return None
+    # Characteristic polynomial x^L - c_1 x^(L-1) - ... - c_L, highest power first.
+    char_poly = [1] + [-int(c) for c in coeffs]
+    order = len(coeffs)
+    roots = []
+    for r in range(-max_base, max_base + 1):
+        if r == 0 or len(roots) == order:
+            continue
+        if sum(c * r**(order - i) for i, c in enumerate(char_poly)) == 0:
+            roots.append(r)
+    if len(roots) != order or not any(abs(r) >= 2 for r in roots):
+        return None
+
+    vandermonde = [[r**n for r in roots] for n in range(1, order + 1)]
+    amplitudes = solve_exact(vandermonde, sequence_data[:order])
+    if amplitudes is None:
+        return None
+    constant = Fraction(0)
+    terms = []
+    for r, amp in zip(roots, amplitudes):
+        if r == 1:
+            constant = amp
+        elif amp != 0:
+            terms.append((amp, r))
+    return (terms, constant) if terms else None
+
+
+def test_exponential_conjecture(sequence_data: SequenceLike) -> Dict[str, Any]:
+    """
+    Tests for a formula like a(n) = A * B^n + C, or a sum Σ A_i * B_i^n + C.
+
+    The single-base case is read off the ratio of first differences; sums of up to
+    max_exponential_terms small integer bases are split out of the minimal recurrence.
+    Both are verified in exact integer arithmetic over the whole sequence.
+    """
+    sequence_data = SequenceView.of(sequence_data)
+    if len(sequence_data) < 5:
         return {"status": "failed"}
+    max_terms = CONFIG.get('max_exponential_terms', 3)
+    max_base = CONFIG.get('max_exponential_base', 100)
 
-    if not np.all(np.isfinite(coeffs)) or not all(abs(c - round(c)) < 1e-9 for c in coeffs):
+    found = None
+    single = _single_exponential(sequence_data)
+    if single is not None:
+        A, B, C = single
+        if verify_exponential_sum([(A, B)], C, sequence_data):
+            found = ([(A, B)], C)
+    if found is None and max_terms > 1:
+        candidate = _exponential_sum(sequence_data, max_terms, max_base)
+        if candidate is not None and verify_exponential_sum(candidate[0], candidate[1], sequence_data):
+            found = candidate
+    if found is None:
         return {"status": "failed"}
 
-    A, B, C = [int(round(c)) for c in coeffs]
-    if B == 1 or A == 0: return {"status": "failed"}
+    terms, C = found
+    n = sympy.symbols('n')
+    exp_formula = sum(sympy.Rational(A.numerator, A.denominator) * sympy.Integer(B)**n for A, B in terms) \
+        + sympy.Rational(C.numerator, C.denominator)
+    logging.info(f"Verified exponential conjecture: a(n) = {exp_formula}")
+    if len(terms) == 1:
+        details = f"Exponential formula with base {terms[0][1]}"
+    else:
+        details = f"Sum of exponentials with bases {', '.join(str(B) for _, B in terms)}"
+    return {"status": "verified", "type": "exponential", "formula_latex": sympy.latex(exp_formula), "details": details}
+
+
+def _holonomic_matrix(sequence_data: SequenceView, order: int, degree: int, rows: int, modulus: Optional[int] = None) -> np.ndarray:
+    """
+    Ansatz matrix for Σ_{i<=order, j<=degree} c_ij n^j a(n-i) = 0, one row per n.
 
+    Column i*(degree+1)+j holds n^j a(n-i) for n = order+1, ..., order+rows (1-based).
+    With a modulus the entries are built directly as int64 residues.
+    """
+    n_values = list(range(order + 1, order + rows + 1))
+    if modulus is None:
+        terms = sequence_data[:order + rows]
+        return np.array([[n**j * terms[n - 1 - i] for i in range(order + 1) for j in range(degree + 1)]
+                         for n in n_values], dtype=object)
+    p = np.array([modulus], dtype=np.int64)
+    a_res = sequence_data.residues(p, order + rows)[0]
+    n_arr = sequence_data.n_values[order:order + rows] % modulus
+    n_pows = np.ones((rows, degree + 1), dtype=np.int64)
+    for j in range(1, degree + 1):
+        n_pows[:, j] = n_pows[:, j - 1] * n_arr % modulus
+    idx = np.array(n_values) - 1
+    cols = [n_pows[:, j] * a_res[idx - i] % modulus for i in range(order + 1) for j in range(degree + 1)]
+    return np.stack(cols, axis=1)
+
+
+def _reduce_holonomic(polys: List[List[int]], first_n: int, last_n: int) -> Tuple[List[List[int]], List[int]]:
+    """
+    Divides out the polynomial gcd of the p_i (lowest power first in and out), and
+    returns the reduced polynomials with the integer roots of p_0 in [first_n, last_n].
+
+    A common factor vanishes at its integer roots, where it would hide the terms that
+    break the recurrence; after the division those indices are verified like any
+    other. Roots of the reduced p_0 are indices whose term the recurrence does not
+    determine (it still has to hold there).
+    """
     n = sympy.symbols('n')
-    exp_formula = A * (B**n) + C
-    
-    is_verified = all(exp_formula.subs(n, i) == true_val for i, true_val in enumerate(sequence_data, 1))
+    nonzero = [sympy.Poly(list(reversed(p)), n, domain='ZZ') for p in polys if any(p)]
+    common = nonzero[0]
+    for poly in nonzero[1:]:
+        common = sympy.gcd(common, poly)
+    reduced = []
+    for p in polys:
+        if not any(p):
+            reduced.append([0])
+            continue
+        quotient, _ = sympy.div(sympy.Poly(list(reversed(p)), n, domain='ZZ'), common)
+        reduced.append([int(c) for c in reversed(quotient.all_coeffs())])
+    roots = sympy.roots(sympy.Poly(list(reversed(reduced[0])), n), filter='Z')
+    return reduced, sorted(int(r) for r in roots if first_n <= r <= last_n)
 
-    if is_verified:
-        logging.info(f"Verified exponential conjecture: a(n) = {A}*({B}**n) + {C}")
-        return {"status": "verified", "type": "exponential", "formula_latex": sympy.latex(exp_formula), "details": f"Exponential formula with base {B}"}
 
+def test_holonomic_conjecture(sequence_data: SequenceLike) -> Dict[str, Any]:
+    """
+    Tests if a sequence is P-recursive: Σ_i p_i(n)·a(n-i) = 0 with polynomial p_i.
+
+    Each (order, degree) ansatz is one linear system. Its rank is first taken modulo a
+    single prime, and only systems with a nontrivial kernel are solved exactly
+    (multi-prime elimination plus rational reconstruction) and verified on all terms.
+    """
+    sequence_data = SequenceView.of(sequence_data)
+    max_order = CONFIG.get('max_holonomic_order', 10)
+    max_degree = CONFIG.get('max_holonomic_degree', 10)
+    count = len(sequence_data)
+    screen_prime = int(primes(1)[0])
+
+    # Smallest ansatz first, so the first hit is the most economical recurrence.
+    shapes = sorted(((r, d) for r in range(1, max_order + 1) for d in range(max_degree + 1)),
+                    key=lambda rd: ((rd[0] + 1) * (rd[1] + 1), rd[0]))
+    for order, degree in shapes:
+        unknowns = (order + 1) * (degree + 1)
+        rows = unknowns + HOLONOMIC_MARGIN
+        if count < order + rows:
+            continue
+        # A prime can only lower the rank, so full rank modulo p rules the shape out exactly.
+        screen = _holonomic_matrix(sequence_data, order, degree, rows, modulus=screen_prime)
+        if rank_mod(screen, np.array([screen_prime], dtype=np.int64)) == unknowns:
+            continue
+        kernel = nullspace_vector(_holonomic_matrix(sequence_data, order, degree, rows))
+        if kernel is None:
+            continue
+        coeffs, _ = scale_to_integers(kernel)
+        g = math.gcd(*coeffs)
+        coeffs = [c // g for c in coeffs]
+        polys = [coeffs[i * (degree + 1):(i + 1) * (degree + 1)] for i in range(order + 1)]
+        # Degenerate kernels (leading or trailing coefficient identically zero) are
+        # shifted copies of a smaller recurrence.
+        if not any(polys[0]) or not any(polys[-1]):
+            continue
+        polys, free_indices = _reduce_holonomic(polys, order + 1, count)
+        if not verify_holonomic_recurrence(polys, sequence_data):
+            continue
+
+        n = sympy.symbols('n')
+        a = sympy.Function('a')
+        lhs = sum(sympy.factor(sum(c * n**j for j, c in enumerate(poly))) * a(n - i)
+                  for i, poly in enumerate(polys) if any(poly))
+        formula_latex = f"{sympy.latex(lhs)} = 0"
+        logging.info(f"Verified holonomic conjecture: {lhs} = 0")
+        details = f"Holonomic recurrence of order {order} with polynomial coefficients of degree {degree}"
+        if free_indices:
+            details += f"; a(n) is not determined by the recurrence at n = {', '.join(map(str, free_indices))}"
+        return {"status": "verified", "type": "holonomic_recurrence", "formula_latex": formula_latex,
+                "details": details}
     return {"status": "failed"}
@@ -0,0 +1,152 @@
+# src/core/fetcher.py
+
+"""
+Concurrent, rate-limited b-file downloads.
+
+All fetches go through the fetcher's own requests.Session, which starts with the
+headers and cookies of the warm-up session and has a bounded pool of keep-alive
+connections. The pool blocks, so callers beyond its size wait for a free connection
+instead of opening more. Every request first takes a token from an
+AdaptiveRateLimiter (core/rate_limit.py), which backs off on 429/503 responses and
+honours Retry-After.
+
+fetch_b_file() sends the ETag / Last-Modified validators of a cached copy as a
+conditional GET. An unchanged b-file then costs a 304 instead of a full download.
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from core.rate_limit import THROTTLE_STATUSES, AdaptiveRateLimiter, parse_retry_after
+from core.target_finder import b_file_url, parse_b_file
+
+
+class BFile(NamedTuple):
+    """
+    A fetched b-file with its cache validators; `terms` is None when it was not modified.
+
+    `offset` is the index of the first term, and `truncated` is set when the term or
+    digit cap stopped the download.
+    """
+    terms: Optional[List[int]]
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    not_modified: bool = False
+    offset: Optional[int] = None
+    truncated: bool = False
+
+
+class BFileFetcher:
+    """
+    Fetches b-files concurrently over a pooled session, under an AdaptiveRateLimiter.
+
+    fetch() is safe to call from many threads at once. `session` is only copied
+    from (headers and cookies); the pool is mounted on a session of the fetcher's
+    own, so other users of `session` keep their own connections. Responses are
+    streamed and parsed line by line. A download stops after `max_terms` terms or
+    `max_digits` digits in total, which bounds the memory one b-file can take.
+    """
+
+    def __init__(self, session: requests.Session, max_connections: int = 4, rate_per_sec: float = 3.0,
+                 burst: Optional[int] = None, max_retries: int = 3, retry_base_sleep: float = 1.0,
+                 timeout_sec: float = 15.0, max_terms: Optional[int] = None, max_digits: Optional[int] = None):
+        self.session = requests.Session()
+        self.session.headers.update(session.headers)
+        self.session.cookies.update(session.cookies)
+        self.max_terms = max_terms
+        self.max_digits = max_digits
+        self.max_connections = max(1, max_connections)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_connections, pool_block=True)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.limiter = AdaptiveRateLimiter(rate_per_sec, burst or self.max_connections)
+        self.max_retries = max(1, max_retries)
+        self.retry_base_sleep = retry_base_sleep
+        self.timeout_sec = timeout_sec
+        self.stats: Dict[str, int] = {"requests": 0, "not_modified": 0, "throttled": 0, "retries": 0,
+                                      "not_found": 0, "failed": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def fetch(self, oeis_id: str) -> Optional[List[int]]:
+        """Terms of the b-file, or None if it does not exist, is empty, or every attempt failed."""
+        b_file = self.fetch_b_file(oeis_id)
+        return b_file.terms if b_file is not None else None
+
+    def fetch_b_file(self, oeis_id: str, etag: Optional[str] = None,
+                     last_modified: Optional[str] = None) -> Optional[BFile]:
+        """
+        Fetches the b-file, conditionally if validators of a cached copy are given.
+
+        Returns BFile(None, ..., not_modified=True) on a 304, and None if the b-file
+        does not exist, is empty, or every attempt failed. Throttled attempts wait for
+        the limiter (and any Retry-After). Other transient failures back off
+        exponentially from `retry_base_sleep`.
+        """
+        url = b_file_url(oeis_id)
+        if url is None:
+            logging.warning("Invalid OEIS ID format passed to the b-file fetcher: %s", oeis_id)
+            return None
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        last_err = None
+        for attempt in range(1, self.max_retries + 1):
+            if attempt > 1:
+                self._count("retries")
+            self.limiter.acquire()
+            self._count("requests")
+            try:
+                with self.session.get(url, headers=headers, timeout=self.timeout_sec, stream=True) as response:
+                    if response.status_code in THROTTLE_STATUSES:
+                        self._count("throttled")
+                        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                        self.limiter.on_throttle(retry_after)
+                        last_err = f"HTTP {response.status_code}" + (f", Retry-After {retry_after:.0f}s" if retry_after else "")
+                        logging.warning("Throttled fetching %s (%s); rate now %.2f/s.", oeis_id, last_err, self.limiter.rate)
+                        continue
+                    if response.status_code == 404:
+                        self._count("not_found")
+                        logging.warning("No b-file for %s (HTTP 404).", oeis_id)
+                        return None
+                    if response.status_code == 304 and headers:
+                        self.limiter.on_success()
+                        self._count("not_modified")
+                        return BFile(None, response.headers.get("ETag", etag),
+                                     response.headers.get("Last-Modified", last_modified), not_modified=True)
+                    if response.ok:
+                        self.limiter.on_success()
+                        response.encoding = response.encoding or "utf-8"
+                        parsed = parse_b_file(response.iter_lines(decode_unicode=True), self.max_terms, self.max_digits)
+                        if not parsed.terms:
+                            logging.warning("B-file for %s was empty or unparseable.", oeis_id)
+                            return None
+                        if parsed.truncated:
+                            logging.info("Read the first %d terms of the b-file for %s (capped or malformed beyond).",
+                                         len(parsed.terms), oeis_id)
+                        return BFile(parsed.terms, response.headers.get("ETag"), response.headers.get("Last-Modified"),
+                                     offset=parsed.offset, truncated=parsed.truncated)
+                    last_err = f"HTTP {response.status_code}"
+                    if response.status_code < 500:
+                        break
+            except requests.RequestException as e:
+                last_err = e
+            if attempt < self.max_retries:
+                sleep_s = self.retry_base_sleep * (2 ** (attempt - 1))
+                logging.warning("Fetch attempt %d/%d for %s failed: %s. Retrying in %.1fs",
+                                attempt, self.max_retries, oeis_id, last_err, sleep_s)
+                time.sleep(sleep_s)
+        self._count("failed")
+        logging.error("Failed to fetch data for %s after %d attempts. Last error: %s",
+                      oeis_id, attempt, last_err)
+        return None
@@ -0,0 +1,482 @@
+# src/core/linalg.py
+
+"""
+Exact linear algebra shared by the conjecture engines.
+
+Systems are reduced modulo several word-size primes at once (one NumPy axis per
+prime), then lifted back to the rationals with the Chinese Remainder Theorem and
+rational reconstruction. All arithmetic stays in int64: the primes are below 2**31,
+so a product of two residues never exceeds 2**62. Callers are expected to verify
+any reconstructed solution exactly against the original integers.
+"""
+
+import math
+import numpy as np
+import sympy
+from fractions import Fraction
+from typing import Callable, List, Optional, Sequence, Tuple
+
+# Number of primes tried first; doubled while the reconstruction is unstable.
+DEFAULT_NUM_PRIMES = 4
+MAX_NUM_PRIMES = 32
+# Batched helpers pad sequences of similar length to the longest in their bucket;
+# a bucket's shortest sequence has at least this fraction of its longest's terms.
+BUCKET_MIN_FILL = 0.75
+
+_PRIME_CACHE: List[int] = []
+
+
+def primes(count: int = DEFAULT_NUM_PRIMES) -> np.ndarray:
+    """Returns the `count` largest primes below 2**31 as an int64 array."""
+    while len(_PRIME_CACHE) < count:
+        _PRIME_CACHE.append(int(sympy.prevprime(_PRIME_CACHE[-1] if _PRIME_CACHE else 2**31)))
+    return np.array(_PRIME_CACHE[:count], dtype=np.int64)
+
+
+def exact_array(values: Sequence[int], headroom_bits: int = 0) -> np.ndarray:
+    """
+    Returns the values as an int64 array when every entry (scaled by 2**headroom_bits)
+    fits comfortably in 64 bits, and as an object array of Python ints otherwise.
+    """
+    limit = 1 << max(62 - headroom_bits, 0)
+    if len(values) and max(abs(int(v)) for v in values) < limit:
+        return np.array(values, dtype=np.int64)
+    return np.array([int(v) for v in values], dtype=object)
+
+
+def residues(values, prime_array: np.ndarray) -> np.ndarray:
+    """
+    Reduces an array-like of (arbitrary-size) integers modulo every prime.
+
+    Returns an int64 array of shape (len(prime_array), *shape) with entries in [0, p).
+    """
+    arr = np.asarray(values)
+    if arr.dtype != object and np.issubdtype(arr.dtype, np.integer):
+        arr = arr.astype(np.int64)
+        return arr[None, ...] % prime_array.reshape((-1,) + (1,) * arr.ndim)
+    arr = np.asarray(arr, dtype=object)
+    mods = np.array([int(p) for p in prime_array], dtype=object).reshape((-1,) + (1,) * arr.ndim)
+    return (arr[None, ...] % mods).astype(np.int64)
+
+
+def length_buckets(lengths: Sequence[int], min_fill: float = BUCKET_MIN_FILL) -> List[List[int]]:
+    """
+    Groups indices into buckets of similar lengths, longest first: within a bucket the
+    shortest length is at least `min_fill` times the longest, which bounds the padding.
+    """
+    buckets: List[List[int]] = []
+    longest = 0
+    for i in sorted(range(len(lengths)), key=lambda i: -lengths[i]):
+        if not buckets or lengths[i] < min_fill * longest:
+            buckets.append([])
+            longest = lengths[i]
+        buckets[-1].append(i)
+    return buckets
+
+
+def _residues_of(terms, prime_array: np.ndarray, length: Optional[int]) -> np.ndarray:
+    """Residues of the first `length` terms, reusing a SequenceView's cache when one is passed."""
+    if hasattr(terms, "residues"):
+        return terms.residues(prime_array, length)
+    return residues(list(terms[:length] if length is not None else terms), prime_array)
+
+
+def inv_mod(a: np.ndarray, p: np.ndarray) -> np.ndarray:
+    """Elementwise modular inverse a^(p-2) mod p for nonzero residues, vectorized over both."""
+    a = np.asarray(a, dtype=np.int64) % p
+    result = np.ones_like(a)
+    exponent = np.broadcast_to(p - 2, a.shape).copy()
+    base = a.copy()
+    while np.any(exponent > 0):
+        odd = (exponent & 1).astype(bool)
+        result = np.where(odd, result * base % p, result)
+        base = base * base % p
+        exponent >>= 1
+    return result
+
+
+def row_reduce_mod(M: np.ndarray, prime_array: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Batched reduced row echelon form of M[i] modulo prime_array[i].
+
+    M has shape (P, rows, cols). Returns (R, pivots, rank) where pivots[i, r] is the
+    pivot column of row r of R[i] (or -1) and rank[i] is the rank modulo that prime.
+    Each prime keeps its own pivot sequence, so unlucky primes do not stall the batch.
+    """
+    R = np.array(M, dtype=np.int64, copy=True)
+    P, m, k = R.shape
+    pivots = np.full((P, m), -1, dtype=np.int64)
+    rank = np.zeros(P, dtype=np.int64)
+    row_ids = np.arange(m)
+    for c in range(k):
+        candidates = (R[:, :, c] != 0) & (row_ids[None, :] >= rank[:, None])
+        has_pivot = candidates.any(axis=1) & (rank < m)
+        if not has_pivot.any():
+            continue
+        sel = np.nonzero(has_pivot)[0]
+        top = rank[sel]
+        piv = candidates[sel].argmax(axis=1)
+        p_sel = prime_array[sel]
+
+        swapped = R[sel, piv].copy()
+        R[sel, piv] = R[sel, top]
+        pivot_rows = swapped * inv_mod(swapped[:, c], p_sel)[:, None] % p_sel[:, None]
+        R[sel, top] = pivot_rows
+
+        factors = R[sel, :, c].copy()
+        factors[np.arange(len(sel)), top] = 0
+        block = R[sel] - factors[:, :, None] * pivot_rows[:, None, :] % p_sel[:, None, None]
+        R[sel] = block % p_sel[:, None, None]
+
+        pivots[sel, top] = c
+        rank[sel] += 1
+    return R, pivots, rank
+
+
+def rank_mod(M, prime_array: Optional[np.ndarray] = None) -> int:
+    """Rank of an integer matrix modulo the given primes (a lower bound on the rational rank)."""
+    prime_array = primes(1) if prime_array is None else prime_array
+    _, _, rank = row_reduce_mod(residues(M, prime_array), prime_array)
+    return int(rank.max())
+
+
+def crt(res: Sequence[int], moduli: Sequence[int]) -> Tuple[int, int]:
+    """Combines residues with pairwise coprime moduli; returns (x, M) with 0 <= x < M."""
+    x, M = 0, 1
+    for r, m in zip(res, moduli):
+        r, m = int(r), int(m)
+        t = (r - x) * pow(M, -1, m) % m
+        x += M * t
+        M *= m
+    return x, M
+
+
+def rational_reconstruct(a: int, m: int) -> Optional[Fraction]:
+    """
+    Finds n/d with |n|, d <= sqrt(m/2) and n ≡ a·d (mod m), or None if there is none.
+    """
+    bound = math.isqrt(m // 2)
+    r0, r1 = m, a % m
+    s0, s1 = 0, 1
+    while r1 > bound:
+        q = r0 // r1
+        r0, r1 = r1, r0 - q * r1
+        s0, s1 = s1, s0 - q * s1
+    if s1 == 0 or abs(s1) > bound:
+        return None
+    frac = Fraction(r1, s1)
+    if (frac.numerator - a * frac.denominator) % m != 0:
+        return None
+    return frac
+
+
+def reconstruct_rationals(res: np.ndarray, prime_array: np.ndarray) -> Optional[List[Fraction]]:
+    """
+    Lifts a (P, k) matrix of per-prime residues to k rationals.
+
+    The result is accepted only if it is stable, i.e. dropping the last prime
+    reconstructs the same values; otherwise the modulus is too small and None is returned.
+    """
+    moduli = [int(p) for p in prime_array]
+    values = []
+    for col in np.asarray(res).T:
+        x, M = crt(col, moduli)
+        frac = rational_reconstruct(x, M)
+        if frac is None:
+            return None
+        if len(moduli) > 1:
+            x_sub, M_sub = crt(col[:-1], moduli[:-1])
+            if rational_reconstruct(x_sub, M_sub) != frac:
+                return None
+        values.append(frac)
+    return values
+
+
+def _select_primes(rank: np.ndarray, pivots: np.ndarray) -> np.ndarray:
+    """
+    Indices of the primes that agree with the most likely rational pivot structure.
+
+    A prime can only lose rank, so the maximal rank is trusted and, among those, the
+    pivot pattern of the first such prime.
+    """
+    best = rank == rank.max()
+    first = int(np.nonzero(best)[0][0])
+    same = np.all(pivots == pivots[first], axis=1)
+    return np.nonzero(best & same)[0]
+
+
+def solve_exact(A, b, max_primes: int = MAX_NUM_PRIMES) -> Optional[List[Fraction]]:
+    """
+    Solves A x = b over the rationals via modular elimination.
+
+    A is an (m, k) integer matrix (int64 or object), b a length-m vector. Returns a
+    solution with the free variables set to zero, or None if the system is
+    inconsistent or the solution cannot be reconstructed within max_primes primes.
+    """
+    A = np.asarray(A)
+    b = np.asarray(b)
+    aug = np.concatenate([A.astype(object), b.astype(object).reshape(-1, 1)], axis=1)
+    return solve_augmented(lambda prime_array: residues(aug, prime_array), A.shape[1], max_primes)
+
+
+def solve_augmented(build: Callable[[np.ndarray], np.ndarray], k: int,
+                    max_primes: int = MAX_NUM_PRIMES) -> Optional[List[Fraction]]:
+    """
+    Solves a system given as a builder of its augmented residue matrix [A | b].
+
+    build(prime_array) must return the (P, m, k + 1) residues modulo each prime. This
+    lets callers that keep a precomputed design matrix slice it instead of handing
+    over big-integer entries; it is called again only when more primes are needed.
+    """
+    count = DEFAULT_NUM_PRIMES
+    while True:
+        prime_array = primes(count)
+        R, pivots, _ = row_reduce_mod(build(prime_array), prime_array)
+        rank_A = ((pivots >= 0) & (pivots < k)).sum(axis=1)
+        consistent = ~np.any(pivots == k, axis=1)
+        sel = _select_primes(rank_A, np.where(pivots == k, -1, pivots))
+        sel = sel[consistent[sel]]
+        if len(sel) == 0:
+            return None
+        sol = np.zeros((len(sel), k), dtype=np.int64)
+        for i, idx in enumerate(sel):
+            for r, c in enumerate(pivots[idx]):
+                if 0 <= c < k:
+                    sol[i, c] = R[idx, r, k]
+        values = reconstruct_rationals(sol, prime_array[sel])
+        if values is not None:
+            return values
+        if count >= max_primes:
+            return None
+        count = min(2 * count, max_primes)
+
+
+def nullspace_vector(A, max_primes: int = MAX_NUM_PRIMES) -> Optional[List[Fraction]]:
+    """
+    Returns one nonzero rational vector x with A x = 0, or None if the kernel is trivial.
+
+    The kernel vector belongs to the first free column of the reduced matrix and is
+    normalized so that this entry equals 1.
+    """
+    A = np.asarray(A)
+    k = A.shape[1]
+    count = DEFAULT_NUM_PRIMES
+    while True:
+        prime_array = primes(count)
+        R, pivots, rank = row_reduce_mod(residues(A, prime_array), prime_array)
+        sel = _select_primes(rank, pivots)
+        if int(rank[sel[0]]) >= k:
+            return None
+        pivot_cols = [int(c) for c in pivots[sel[0]] if c >= 0]
+        free = next(c for c in range(k) if c not in pivot_cols)
+        vec = np.zeros((len(sel), k), dtype=np.int64)
+        vec[:, free] = 1
+        for r, c in enumerate(pivot_cols):
+            vec[:, c] = (prime_array[sel] - R[sel, r, free]) % prime_array[sel]
+        values = reconstruct_rationals(vec, prime_array[sel])
+        if values is not None:
+            return values
+        if count >= max_primes:
+            return None
+        count = min(2 * count, max_primes)
+
+
+def berlekamp_massey_mod(S: np.ndarray, prime_array: np.ndarray,
+                         lengths: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batched Berlekamp-Massey: row i of S is a sequence of residues modulo prime_array[i].
+
+    Returns (C, L) where C[i] is the connection polynomial (C[i, 0] = 1) of the shortest
+    recurrence generating row i and L[i] its length. Rows may mix sequences and primes.
+    With `lengths`, row i only has lengths[i] terms: its state stops changing after
+    them, so the padding beyond is never read into the result.
+    """
+    S = np.asarray(S, dtype=np.int64)
+    rows, n = S.shape
+    p = np.asarray(prime_array, dtype=np.int64)
+    pcol = p[:, None]
+    C = np.zeros((rows, n + 1), dtype=np.int64)
+    C[:, 0] = 1
+    B = C.copy()
+    L = np.zeros(rows, dtype=np.int64)
+    m = np.ones(rows, dtype=np.int64)
+    b = np.ones(rows, dtype=np.int64)
+    row_ids = np.arange(rows)[:, None]
+    col_ids = np.arange(n + 1)[None, :]
+    for i in range(n):
+        d = ((C[:, :i + 1] * S[:, i::-1]) % pcol).sum(axis=1) % p
+        nonzero = d != 0
+        if lengths is not None:
+            nonzero &= i < lengths
+        if not nonzero.any():
+            m += 1
+            continue
+        coef = d * inv_mod(b, p) % p
+        shift = col_ids - m[:, None]
+        shifted_B = np.where(shift >= 0, B[row_ids, np.clip(shift, 0, n)], 0)
+        new_C = (C - coef[:, None] * shifted_B % pcol) % pcol
+        grow = nonzero & (2 * L <= i)
+        B = np.where(grow[:, None], C, B)
+        b = np.where(grow, d, b)
+        L = np.where(grow, i + 1 - L, L)
+        m = np.where(grow, 1, m + 1)
+        C = np.where(nonzero[:, None], new_C, C)
+    return C, L
+
+
+def _recurrence_from_bm(C: np.ndarray, L: np.ndarray, prime_array: np.ndarray) -> Optional[List[Fraction]]:
+    """Lifts one sequence's Berlekamp-Massey output over a prime batch to Q (None if unstable)."""
+    order = int(L.max())
+    if order == 0:
+        return []
+    sel = np.nonzero(L == order)[0]
+    coeff_res = (prime_array[sel, None] - C[sel, 1:order + 1]) % prime_array[sel, None]
+    return reconstruct_rationals(coeff_res, prime_array[sel])
+
+
+def minimal_recurrence(terms: Sequence[int], max_primes: int = MAX_NUM_PRIMES,
+                       length: Optional[int] = None) -> Optional[List[Fraction]]:
+    """
+    Coefficients c_1, ..., c_L of the shortest recurrence a(i) = Σ c_j a(i-j) over Q
+    generating the first `length` terms (default: all).
+
+    Runs Berlekamp-Massey modulo a batch of primes, trusts the primes that report the
+    longest recurrence (a prime can only shorten it) and reconstructs the rationals.
+    Returns [] for an all-zero sequence and None if reconstruction does not stabilize.
+    """
+    count = DEFAULT_NUM_PRIMES
+    while True:
+        prime_array = primes(count)
+        C, L = berlekamp_massey_mod(_residues_of(terms, prime_array, length), prime_array)
+        values = _recurrence_from_bm(C, L, prime_array)
+        if values is not None:
+            return values
+        if count >= max_primes:
+            return None
+        count = min(2 * count, max_primes)
+
+
+def minimal_recurrences(sequences: Sequence[Sequence[int]], max_primes: int = MAX_NUM_PRIMES,
+                        length: Optional[int] = None) -> List[Optional[List[Fraction]]]:
+    """
+    minimal_recurrence() for many sequences at once, in input order.
+
+    Sequences of similar length (after truncation to `length`; see length_buckets())
+    share one Berlekamp-Massey call whose rows are every (sequence, prime) pair, padded
+    to the longest and masked to each sequence's own terms. Only the sequences whose
+    reconstruction is unstable are retried with more primes.
+    """
+    results: List[Optional[List[Fraction]]] = [None] * len(sequences)
+    counts = [len(terms) if length is None else min(len(terms), length) for terms in sequences]
+    for pending in length_buckets(counts):
+        n = max(counts[i] for i in pending)
+        count = DEFAULT_NUM_PRIMES
+        while pending:
+            prime_array = primes(count)
+            S = np.zeros((len(pending), count, n), dtype=np.int64)
+            for j, i in enumerate(pending):
+                S[j, :, :counts[i]] = _residues_of(sequences[i], prime_array, counts[i])
+            C, L = berlekamp_massey_mod(S.reshape(len(pending) * count, n), np.tile(prime_array, len(pending)),
+                                        np.repeat([counts[i] for i in pending], count))
+            retry = []
+            for j, i in enumerate(pending):
+                block = slice(j * count, (j + 1) * count)
+                results[i] = _recurrence_from_bm(C[block], L[block], prime_array)
+                if results[i] is None and count < max_primes:
+                    retry.append(i)
+            pending = retry
+            count = min(2 * count, max_primes)
+    return results
+
+
+def _poly_trim(a: np.ndarray) -> np.ndarray:
+    """Drops zero high-order coefficients (polynomials are stored lowest power first)."""
+    nz = np.nonzero(a)[0]
+    return a[:nz[-1] + 1] if len(nz) else a[:0]
+
+
+def _poly_mul_mod(a: np.ndarray, b: np.ndarray, p: int) -> np.ndarray:
+    """Product of two residue polynomials, one vector update per coefficient of the shorter one."""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros(0, dtype=np.int64)
+    if len(a) > len(b):
+        a, b = b, a
+    out = np.zeros(len(a) + len(b) - 1, dtype=np.int64)
+    for i, c in enumerate(a):
+        if c:
+            out[i:i + len(b)] = (out[i:i + len(b)] + c * b % p) % p
+    return out
+
+
+def _poly_divmod_mod(a: np.ndarray, b: np.ndarray, p: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Quotient and remainder of residue polynomials a / b modulo p (b nonzero)."""
+    a = a.copy()
+    db = len(b) - 1
+    inv = pow(int(b[-1]), -1, p)
+    q = np.zeros(max(len(a) - db, 0), dtype=np.int64)
+    for i in range(len(a) - 1 - db, -1, -1):
+        c = int(a[i + db]) * inv % p
+        q[i] = c
+        if c:
+            a[i:i + db + 1] = (a[i:i + db + 1] - c * b % p) % p
+    return q, _poly_trim(a[:db])
+
+
+def pade_mod(series: np.ndarray, p: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Padé approximant of a residue power series S (N coefficients) modulo p.
+
+    Runs the extended Euclidean algorithm on (x^N, S) until the remainder has degree
+    below N/2, giving P ≡ Q·S (mod x^N) with Q(0) = 1. Returns (P, Q) lowest power
+    first, or None if Q(0) vanishes modulo p.
+    """
+    N = len(series)
+    r0 = np.zeros(N + 1, dtype=np.int64)
+    r0[N] = 1
+    r1 = _poly_trim(np.asarray(series, dtype=np.int64) % p)
+    t0 = np.zeros(0, dtype=np.int64)
+    t1 = np.ones(1, dtype=np.int64)
+    half = (N + 1) // 2
+    while len(r1) > half:
+        q, r = _poly_divmod_mod(r0, r1, p)
+        qt = _poly_mul_mod(q, t1, p)
+        t_next = np.zeros(max(len(t0), len(qt)), dtype=np.int64)
+        t_next[:len(t0)] += t0
+        t_next[:len(qt)] -= qt
+        r0, r1 = r1, r
+        t0, t1 = t1, _poly_trim(t_next % p)
+    if len(t1) == 0 or t1[0] == 0:
+        return None
+    inv = pow(int(t1[0]), -1, p)
+    return r1 * inv % p, t1 * inv % p
+
+
+def rational_generating_function(terms: Sequence[int], max_primes: int = MAX_NUM_PRIMES,
+                                 length: Optional[int] = None) -> Optional[List[Fraction]]:
+    """
+    Denominator Q(x) = 1 + q_1 x + ... + q_d x^d of the Padé approximant of Σ a_i x^i over Q,
+    taken over the first `length` terms (default: all).
+
+    Computed modulo a batch of primes with the extended Euclidean algorithm; primes
+    whose denominator degree is below the maximum are discarded as unlucky.
+    Returns the coefficients [1, q_1, ..., q_d], or None if they do not reconstruct.
+    """
+    count = DEFAULT_NUM_PRIMES
+    while True:
+        prime_array = primes(count)
+        series = _residues_of(terms, prime_array, length)
+        dens = []
+        for row, p in zip(series, prime_array):
+            approx = pade_mod(row, int(p))
+            dens.append(None if approx is None else approx[1])
+        degrees = [len(q) if q is not None else -1 for q in dens]
+        best = max(degrees)
+        if best <= 0:
+            return None
+        sel = [i for i, deg in enumerate(degrees) if deg == best]
+        values = reconstruct_rationals(np.stack([dens[i] for i in sel]), prime_array[sel])
+        if values is not None:
+            return values
+        if count >= max_primes:
+            return None
+        count = min(2 * count, max_primes)
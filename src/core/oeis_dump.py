@@ -0,0 +1,195 @@
+# src/core/oeis_dump.py
+
+"""
+Local store of the OEIS bulk dump, for screening without network round-trips.
+
+The OEIS publishes the first terms of every sequence as stripped.gz, with lines like
+"A000045 ,0,1,1,2,3,5,", and the names as names.gz, with lines like
+"A000045 Fibonacci numbers...". OeisDump imports both into an SQLite table keyed by
+OEIS ID. screen() then runs the batched conjecture tests over those terms in chunks
+of thousands of sequences. Only the sequences that pass the screen are worth a
+b-file fetch and a full analysis.
+"""
+
+import gzip
+import logging
+import os
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, TextIO, Tuple
+
+from core.conjecture_engine import test_linear_recurrence_conjecture_batch, test_polynomial_conjecture_batch
+
+# Rows per executemany() call while importing, and sequences per batched test call.
+IMPORT_BATCH = 10000
+SCREEN_BATCH = 2000
+# Screening tests, simplest first; a sequence stops at the first one that verifies.
+SCREEN_TESTS: List[Tuple[str, Callable[[Sequence[Sequence[int]]], List[Dict[str, Any]]]]] = [
+    ("polynomial", test_polynomial_conjecture_batch),
+    ("linear_recurrence", test_linear_recurrence_conjecture_batch),
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sequences (
+    oeis_id   TEXT PRIMARY KEY,
+    name      TEXT,
+    terms     TEXT,
+    num_terms INTEGER
+)
+"""
+_INDEX = "CREATE INDEX IF NOT EXISTS sequences_num_terms ON sequences (num_terms)"
+
+
+def _open_text(path: str) -> TextIO:
+    """Opens a dump file, gzip-compressed or not."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, "r", encoding="utf-8", errors="replace")
+
+
+def parse_stripped(lines: Iterable[str]) -> Iterator[Tuple[str, str, int]]:
+    """(oeis_id, comma-separated terms, number of terms) per stripped.gz line; comments are skipped."""
+    for line in lines:
+        if not line.startswith("A"):
+            continue
+        oeis_id, _, rest = line.partition(" ")
+        terms = [t for t in rest.strip().strip(",").split(",") if t]
+        try:
+            for t in terms:
+                int(t)
+        except ValueError:
+            logging.debug("Skipping malformed dump line for %s.", oeis_id)
+            continue
+        yield oeis_id, ",".join(terms), len(terms)
+
+
+def parse_names(lines: Iterable[str]) -> Iterator[Tuple[str, str]]:
+    """(oeis_id, name) per names.gz line; comments are skipped."""
+    for line in lines:
+        if not line.startswith("A"):
+            continue
+        oeis_id, _, name = line.partition(" ")
+        yield oeis_id, name.strip()
+
+
+def _batched(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class OeisDump:
+    """The imported dump: first terms and names by OEIS ID. Safe to share between threads."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(_SCHEMA)
+            self._conn.execute(_INDEX)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM sequences WHERE terms IS NOT NULL").fetchone()[0]
+
+    def __contains__(self, oeis_id: str) -> bool:
+        return self.terms(oeis_id) is not None
+
+    def import_stripped(self, path: str) -> int:
+        """Imports (or refreshes) the terms from a stripped dump; returns the number of sequences."""
+        count = 0
+        with _open_text(path) as f:
+            for batch in _batched(parse_stripped(f), IMPORT_BATCH):
+                with self._lock, self._conn:
+                    self._conn.executemany(
+                        "INSERT INTO sequences (oeis_id, terms, num_terms) VALUES (?, ?, ?) "
+                        "ON CONFLICT(oeis_id) DO UPDATE SET terms = excluded.terms, num_terms = excluded.num_terms",
+                        batch)
+                count += len(batch)
+        logging.info("Imported the terms of %d sequences from %s into %s.", count, path, self.path)
+        return count
+
+    def import_names(self, path: str) -> int:
+        """Imports (or refreshes) the names from a names dump; returns the number of sequences."""
+        count = 0
+        with _open_text(path) as f:
+            for batch in _batched(parse_names(f), IMPORT_BATCH):
+                with self._lock, self._conn:
+                    self._conn.executemany(
+                        "INSERT INTO sequences (oeis_id, name) VALUES (?, ?) "
+                        "ON CONFLICT(oeis_id) DO UPDATE SET name = excluded.name",
+                        batch)
+                count += len(batch)
+        logging.info("Imported the names of %d sequences from %s into %s.", count, path, self.path)
+        return count
+
+    def terms(self, oeis_id: str) -> Optional[List[int]]:
+        with self._lock:
+            row = self._conn.execute("SELECT terms FROM sequences WHERE oeis_id = ?", (oeis_id,)).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return [int(t) for t in row[0].split(",") if t]
+
+    def name(self, oeis_id: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT name FROM sequences WHERE oeis_id = ?", (oeis_id,)).fetchone()
+        return row[0] if row else None
+
+    def iter_batches(self, min_terms: int = 0, batch_size: int = SCREEN_BATCH) -> Iterator[List[Tuple[str, List[int]]]]:
+        """All sequences with at least `min_terms` terms, in ID order, as lists of (oeis_id, terms)."""
+        last_id = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT oeis_id, terms FROM sequences WHERE oeis_id > ? AND terms IS NOT NULL "
+                    "AND num_terms >= ? ORDER BY oeis_id LIMIT ?", (last_id, min_terms, batch_size)).fetchall()
+            if not rows:
+                return
+            last_id = rows[-1][0]
+            yield [(oeis_id, [int(t) for t in terms.split(",") if t]) for oeis_id, terms in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def screen(dump: OeisDump, min_terms: int = 0, exclude: Optional[Set[str]] = None,
+           keep: Optional[Callable[[str], bool]] = None,
+           batch_size: int = SCREEN_BATCH) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """
+    Runs SCREEN_TESTS over the dump and yields (oeis_id, label, result) for every sequence
+    whose first terms verify a formula.
+
+    IDs in `exclude`, or rejected by `keep` (e.g. a shard filter), are not tested.
+    Results come in ID order, one batch at a time, so the caller can stop early.
+    """
+    exclude = exclude or set()
+    screened = passed = 0
+    for batch in dump.iter_batches(min_terms, batch_size):
+        pending = [(oeis_id, terms) for oeis_id, terms in batch
+                   if oeis_id not in exclude and (keep is None or keep(oeis_id))]
+        screened += len(pending)
+        found: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+        for label, test_batch in SCREEN_TESTS:
+            if not pending:
+                break
+            results = test_batch([terms for _, terms in pending])
+            still_pending = []
+            for (oeis_id, terms), res in zip(pending, results):
+                if res.get("status") == "verified":
+                    found[oeis_id] = (label, res)
+                else:
+                    still_pending.append((oeis_id, terms))
+            pending = still_pending
+        passed += len(found)
+        logging.info("Screened %d sequences from the dump so far; %d passed.", screened, passed)
+        for oeis_id in sorted(found):
+            label, res = found[oeis_id]
+            yield oeis_id, label, res
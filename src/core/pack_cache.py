@@ -0,0 +1,401 @@
+# src/core/pack_cache.py
+
+"""
+Append-only pack file of cached sequences, with an index, read through mmap.
+
+Every put() appends one record to the pack:
+
+    header  magic "SQPK", kind, metadata length, number of terms, payload length
+    meta    JSON (oeis_id, offset, etag, last_modified, stored_at), padded to 8 bytes
+    payload KIND_INT64:  the terms as little-endian int64
+            KIND_BIGINT: a uint32 byte length per term, then each term's signed
+                         little-endian bytes
+
+get() returns int64 payloads as a read-only np.frombuffer view of the mapped file,
+with no parsing or copy. Big integers skip decimal conversion, whose cost grows quadratically
+with the number of digits. The index maps each ID to its latest record and is written next to the
+pack on flush() and close(). A newer record for an ID leaves the older one in place
+as garbage, as does evicting an ID, until the pack is compacted. touch() also appends
+a record (same payload, new stored_at), so a revalidation survives a crash. If the process is killed, the index lags the
+pack. Opening then rescans only the records appended after the indexed size, and
+drops a torn last record.
+"""
+
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+MAGIC = b"SQPK"
+KIND_INT64 = 1
+KIND_BIGINT = 2
+_HEADER = struct.Struct("<4sBxxxIII")
+_LENGTH = struct.Struct("<I")
+# Terms below this magnitude are stored as int64.
+_INT64_LIMIT = 1 << 63
+# Eviction frees space down to this fraction of the byte budget, so it does not run on every put.
+EVICT_TO_FRACTION = 0.9
+# close() compacts the pack when garbage is more than this fraction of it.
+COMPACT_GARBAGE_FRACTION = 0.25
+
+
+class CacheEntry(NamedTuple):
+    terms: np.ndarray
+    offset: Optional[int]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+
+class _Record(NamedTuple):
+    """Where an ID's latest record lives in the pack, plus its metadata."""
+    position: int
+    size: int
+    kind: int
+    count: int
+    payload_at: int
+    meta: Dict[str, Any]
+
+
+def _encode_terms(terms: Sequence[int]) -> Tuple[int, bytes]:
+    if all(-_INT64_LIMIT <= t < _INT64_LIMIT for t in terms):
+        return KIND_INT64, np.asarray(terms, dtype="<i8").tobytes()
+    raw = [t.to_bytes((t.bit_length() + 8) // 8, "little", signed=True) for t in terms]
+    lengths = np.array([len(r) for r in raw], dtype="<u4")
+    return KIND_BIGINT, lengths.tobytes() + b"".join(raw)
+
+
+def _decode_bigints(buf, start: int, count: int) -> List[int]:
+    """Decodes a length table followed by the concatenated two's-complement bytes."""
+    lengths = np.frombuffer(buf, dtype="<u4", count=count, offset=start)
+    ends = (np.cumsum(lengths, dtype=np.int64) + start + 4 * count).tolist()
+    starts = [start + 4 * count] + ends[:-1]
+    from_bytes = int.from_bytes
+    return [from_bytes(buf[a:b], "little", signed=True) for a, b in zip(starts, ends)]
+
+
+class PackCache:
+    """
+    Cached sequences by OEIS ID in one pack file. Safe to share between threads.
+
+    With `max_bytes`, the live records are kept within that budget by evicting the
+    least recently used ones. The index keeps IDs in recency order, so the order
+    survives restarts. Evicted and superseded records are garbage. compact()
+    rewrites the pack without them. It runs on a background thread when the pack
+    grows past twice the budget, and at close() when garbage is over
+    COMPACT_GARBAGE_FRACTION of the pack. Records are copied without holding the
+    lock; get() and put() only wait for the final swap of the file.
+    """
+
+    def __init__(self, path: str, max_bytes: Optional[int] = None):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        # Serializes compactions; the background one is tracked in _compactor.
+        self._compact_lock = threading.Lock()
+        self._compactor: Optional[threading.Thread] = None
+        # Least recently used first.
+        self._records: "OrderedDict[str, _Record]" = OrderedDict()
+        self._live = 0
+        self._garbage = 0
+        self._dirty = False
+        self._map: Optional[mmap.mmap] = None
+        self._mapped_size = 0
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0, "evicted_bytes": 0,
+                                      "compactions": 0, "reclaimed_bytes": 0}
+        self._load_index()
+        self._file = open(path, "a+b")
+        self._size = self._file.tell()
+        with self._lock:
+            self._evict()
+
+    # --- Index ---
+
+    def _load_index(self) -> None:
+        indexed = 0
+        if os.path.exists(self.index_path) and os.path.exists(self.path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+                # A compacted (replaced) pack has a new inode; its old index must not be used.
+                if (index.get("pack_size", 0) <= os.path.getsize(self.path)
+                        and index.get("pack_inode") == os.stat(self.path).st_ino):
+                    self._records = OrderedDict((oeis_id, _Record(*rec)) for oeis_id, rec in index["records"].items())
+                    self._live = sum(rec.size for rec in self._records.values())
+                    self._garbage = index.get("garbage", 0)
+                    indexed = index["pack_size"]
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logging.warning("Ignoring unreadable pack index %s: %s", self.index_path, e)
+                self._records, self._live, self._garbage = OrderedDict(), 0, 0
+        if os.path.exists(self.path) and os.path.getsize(self.path) > indexed:
+            self._scan(indexed)
+
+    def _scan(self, start: int) -> None:
+        """Indexes the records from `start` on, truncating a torn record at the end."""
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            data = f.read()
+        pos = 0
+        while pos + _HEADER.size <= len(data):
+            magic, kind, meta_len, count, payload_len = _HEADER.unpack_from(data, pos)
+            size = _HEADER.size + meta_len + payload_len
+            if magic != MAGIC or pos + size > len(data):
+                break
+            try:
+                meta = json.loads(data[pos + _HEADER.size:pos + _HEADER.size + meta_len])
+            except ValueError:
+                break
+            self._index_record(meta, _Record(start + pos, size, kind, count, start + pos + _HEADER.size + meta_len, meta))
+            pos += size
+        if pos < len(data):
+            logging.warning("Pack %s: dropping %d bytes of a torn record at the end.", self.path, len(data) - pos)
+            with open(self.path, "r+b") as f:
+                f.truncate(start + pos)
+        self._dirty = True
+
+    def _index_record(self, meta: Dict[str, Any], record: _Record) -> None:
+        previous = self._records.pop(meta["oeis_id"], None)
+        if previous is not None:
+            self._live -= previous.size
+            self._garbage += previous.size
+        self._records[meta["oeis_id"]] = record
+        self._live += record.size
+
+    def flush(self) -> None:
+        """Flushes appended records and writes the index (atomically)."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._file.flush()
+        if not self._dirty:
+            return
+        index = {"pack_size": self._size, "pack_inode": os.fstat(self._file.fileno()).st_ino,
+                 "garbage": self._garbage,
+                 "records": {oeis_id: list(rec) for oeis_id, rec in self._records.items()}}
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(tmp, self.index_path)
+        self._dirty = False
+
+    # --- Access ---
+
+    def __contains__(self, oeis_id: str) -> bool:
+        return oeis_id in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    @property
+    def live_bytes(self) -> int:
+        return self._live
+
+    @property
+    def garbage_bytes(self) -> int:
+        return self._garbage
+
+    def _view(self) -> mmap.mmap:
+        """A read-only map of the pack, remapped when records were appended since."""
+        if self._map is None or self._mapped_size != self._size:
+            self._file.flush()
+            self._unmap()
+            self._map = mmap.mmap(self._file.fileno(), self._size, access=mmap.ACCESS_READ)
+            self._mapped_size = self._size
+        return self._map
+
+    def _unmap(self) -> None:
+        # Arrays returned by get() may still point into the map, and close() fails while
+        # they exist. Dropping the reference unmaps it once the last of them is released;
+        # on POSIX the mapping stays valid even after compaction replaces the file.
+        self._map = None
+
+    def get(self, oeis_id: str) -> Optional[CacheEntry]:
+        """
+        The latest entry for an ID, or None. int64 terms come back as a read-only view of
+        the mapped pack; big integers as an object array of Python ints.
+        """
+        with self._lock:
+            rec = self._records.get(oeis_id)
+            if rec is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            self._records.move_to_end(oeis_id)
+            self._dirty = True
+            view = self._view()
+            if rec.kind == KIND_INT64:
+                terms = np.frombuffer(view, dtype="<i8", count=rec.count, offset=rec.payload_at)
+            else:
+                terms = np.array(_decode_bigints(view, rec.payload_at, rec.count), dtype=object)
+        meta = rec.meta
+        return CacheEntry(terms, meta.get("offset"), meta.get("etag"), meta.get("last_modified"),
+                          meta.get("stored_at", 0.0))
+
+    def put(self, oeis_id: str, terms: Sequence[int], offset: Optional[int] = None, etag: Optional[str] = None,
+            last_modified: Optional[str] = None, stored_at: Optional[float] = None) -> None:
+        terms = [int(t) for t in terms]
+        kind, payload = _encode_terms(terms)
+        meta = {"oeis_id": oeis_id, "offset": offset, "etag": etag, "last_modified": last_modified,
+                "stored_at": time.time() if stored_at is None else stored_at}
+        with self._lock:
+            self._append(meta, kind, len(terms), payload)
+
+    def touch(self, oeis_id: str, stored_at: Optional[float] = None) -> None:
+        """
+        Restarts an entry's age. The payload is copied as is into a new record with the
+        new stored_at, so the reset is in the pack itself and not only in the index.
+        """
+        with self._lock:
+            rec = self._records.get(oeis_id)
+            if rec is None:
+                return
+            meta = dict(rec.meta, stored_at=time.time() if stored_at is None else stored_at)
+            payload = self._view()[rec.payload_at:rec.position + rec.size]
+            self._append(meta, rec.kind, rec.count, payload)
+
+    def _append(self, meta: Dict[str, Any], kind: int, count: int, payload: bytes) -> None:
+        """Appends one record and indexes it; called with the lock held."""
+        meta_raw = json.dumps(meta, separators=(",", ":")).encode("utf-8")
+        meta_raw += b" " * (-(_HEADER.size + len(meta_raw)) % 8)  # 8-byte aligned payload
+        record = _HEADER.pack(MAGIC, kind, len(meta_raw), count, len(payload)) + meta_raw + payload
+        position = self._size
+        self._file.write(record)
+        self._size += len(record)
+        self._index_record(meta, _Record(position, len(record), kind, count,
+                                         position + _HEADER.size + len(meta_raw), meta))
+        self._dirty = True
+        self._evict(keep=meta["oeis_id"])
+        if (self.max_bytes and self._size > 2 * self.max_bytes
+                and (self._compactor is None or not self._compactor.is_alive())):
+            self._compactor = threading.Thread(target=self.compact, name="pack-compact", daemon=True)
+            self._compactor.start()
+
+    # --- Eviction and compaction ---
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        """Drops least recently used records until the live bytes are at EVICT_TO_FRACTION of the budget."""
+        if not self.max_bytes or self._live <= self.max_bytes:
+            return
+        target = EVICT_TO_FRACTION * self.max_bytes
+        for oeis_id in list(self._records):
+            if self._live <= target:
+                break
+            if oeis_id == keep:
+                continue
+            rec = self._records.pop(oeis_id)
+            self._live -= rec.size
+            self._garbage += rec.size
+            self.stats["evictions"] += 1
+            self.stats["evicted_bytes"] += rec.size
+        self._dirty = True
+
+    def compact(self) -> None:
+        """
+        Rewrites the pack with only the live records and drops the garbage.
+
+        The records live at the start are copied from a separate read-only map without
+        holding the lock: the pack is append-only, so they cannot change underneath.
+        Under the lock, the records appended meanwhile are copied as they are, and the
+        new file, index and map replace the old ones. Records that became garbage during
+        the copy stay as garbage in the new pack.
+        """
+        with self._compact_lock:
+            with self._lock:
+                if not self._garbage:
+                    return
+                self._file.flush()
+                snapshot = [(rec.position, rec.size) for rec in self._records.values()]
+                snapshot_size = self._size
+            tmp = self.path + ".compact"
+            moved: Dict[int, int] = {}
+            pos = 0
+            with open(tmp, "wb") as out:
+                if snapshot_size:
+                    with open(self.path, "rb") as f, \
+                            mmap.mmap(f.fileno(), snapshot_size, access=mmap.ACCESS_READ) as view:
+                        for position, size in snapshot:
+                            out.write(view[position:position + size])
+                            moved[position] = pos
+                            pos += size
+                with self._lock:
+                    tail = self._view()[snapshot_size:self._size] if self._size > snapshot_size else b""
+                    out.write(tail)
+                    out.close()
+                    records: "OrderedDict[str, _Record]" = OrderedDict()
+                    for oeis_id, rec in self._records.items():
+                        new = moved[rec.position] if rec.position < snapshot_size else pos + rec.position - snapshot_size
+                        records[oeis_id] = rec._replace(position=new, payload_at=new + rec.payload_at - rec.position)
+                    size = pos + len(tail)
+                    reclaimed = self._size - size
+                    self._unmap()
+                    self._file.close()
+                    os.replace(tmp, self.path)
+                    self._file = open(self.path, "a+b")
+                    self._records, self._size = records, size
+                    self._garbage = size - self._live
+                    self._dirty = True
+                    self._flush()
+                    self.stats["compactions"] += 1
+                    self.stats["reclaimed_bytes"] += reclaimed
+        logging.info("Compacted the sequence cache %s: %d records, %.1f MB reclaimed.",
+                     self.path, len(records), reclaimed / 1e6)
+
+    def close(self) -> None:
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+        if self._garbage > COMPACT_GARBAGE_FRACTION * self._size:
+            self.compact()
+        with self._lock:
+            self._flush()
+            self._unmap()
+            self._file.close()
+
+
+def migrate_json_cache(cache: PackCache, directory: str) -> int:
+    """
+    Moves a legacy cache of one JSON file per ID (a list of terms, or an object with
+    "terms" and validators) into the pack, keeping each file's mtime as its age, and
+    deletes the files. Returns the number of migrated sequences.
+    """
+    if not os.path.isdir(directory):
+        return 0
+    migrated = 0
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            if isinstance(entry, list):
+                entry = {"terms": entry}
+            if entry.get("terms") and name[:-5] not in cache:
+                cache.put(name[:-5], entry["terms"], entry.get("offset"), entry.get("etag"),
+                          entry.get("last_modified"), stored_at=os.path.getmtime(path))
+                migrated += 1
+            os.remove(path)
+        except (OSError, ValueError, AttributeError) as e:
+            logging.warning("Could not migrate cache file %s: %s", path, e)
+    try:
+        os.rmdir(directory)
+    except OSError:
+        pass
+    if migrated:
+        cache.flush()
+        logging.info("Migrated %d cached sequences from %s into %s.", migrated, directory, cache.path)
+    return migrated
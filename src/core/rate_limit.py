@@ -0,0 +1,95 @@
+# src/core/rate_limit.py
+
+"""
+Client-side rate limiting for requests to the OEIS.
+
+AdaptiveRateLimiter is a token bucket whose rate follows AIMD (additive increase,
+multiplicative decrease). Each success adds a little back, up to the configured
+rate, and each 429/503 response halves it. A Retry-After header pauses all callers
+until it has passed. The b-file fetcher and the search harvester each share one
+limiter between all of their threads.
+"""
+
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+# Responses that mean "slow down" rather than "failed".
+THROTTLE_STATUSES = (429, 503)
+# Longest Retry-After that is honoured; a longer one is treated as this.
+MAX_RETRY_AFTER_SEC = 300.0
+# Multiplicative decrease on throttling; the rate never drops below max_rate * MIN_RATE_FRACTION.
+RATE_DECREASE = 0.5
+MIN_RATE_FRACTION = 1 / 16
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date); None if absent or invalid."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class AdaptiveRateLimiter:
+    """
+    Thread-safe token bucket with an AIMD-controlled refill rate.
+
+    acquire() blocks until a token is available. Tokens refill at the current rate
+    up to `burst`, and none accumulate during a Retry-After pause.
+    """
+
+    def __init__(self, rate_per_sec: float, burst: int = 1, increase_per_sec: Optional[float] = None):
+        self.max_rate = rate_per_sec
+        self.rate = rate_per_sec
+        self.min_rate = rate_per_sec * MIN_RATE_FRACTION
+        # Additive increase per successful request; by default a tenth of the configured rate.
+        self.increase = increase_per_sec if increase_per_sec is not None else rate_per_sec / 10
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_throttle(self, retry_after_sec: Optional[float] = None) -> None:
+        """Halves the rate, empties the bucket and pauses everyone for `retry_after_sec` if given."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * RATE_DECREASE)
+            self._tokens = 0.0
+            now = time.monotonic()
+            if retry_after_sec:
+                self._paused_until = max(self._paused_until, now + min(retry_after_sec, MAX_RETRY_AFTER_SEC))
+            self._updated = max(now, self._paused_until)
@@ -3,35 +3,78 @@
 import numpy as np
 import sympy
 import logging
-from typing import List, Dict, Any, Tuple
+from fractions import Fraction
+from typing import Dict, Any, Tuple
 
-def test_rational_conjecture(sequence_data: List[int], oeis_id: str, max_deg: int = 4) -> Dict[str, Any]:
+from core.linalg import solve_augmented
+from core.sequence_view import SequenceLike, SequenceView
+from core.verification import verify_rational_function
+
+
+class _DesignMatrix:
+    """
+    Power columns n^k and a(n)·n^k for k = 0..max_deg, built once per sequence.
+
+    Columns are kept as residues modulo a batch of primes, so every (p_deg, q_deg)
+    system is a slice of the same arrays. Residues are cached per prime batch.
+    """
+
+    def __init__(self, sequence_data: SequenceView, max_deg: int, rows: int):
+        self.sequence_data = sequence_data
+        self.max_deg = max_deg
+        self.rows = rows
+        self._cache: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def columns(self, prime_array: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns (n_pows, a_n_pows), each of shape (P, rows, max_deg + 1)."""
+        key = len(prime_array)
+        if key not in self._cache:
+            p = prime_array[:, None]
+            n_res = self.sequence_data.n_values[None, :self.rows] % p
+            n_pows = np.ones((len(prime_array), self.rows, self.max_deg + 1), dtype=np.int64)
+            for k in range(1, self.max_deg + 1):
+                n_pows[:, :, k] = n_pows[:, :, k - 1] * n_res % p
+            a_res = self.sequence_data.residues(prime_array, self.rows)
+            a_n_pows = a_res[:, :, None] * n_pows % prime_array[:, None, None]
+            self._cache[key] = (n_pows, a_n_pows)
+        return self._cache[key]
+
+    def system(self, prime_array: np.ndarray, p_deg: int, q_deg: int, fit_points: int) -> np.ndarray:
+        """
+        Augmented residues of P(n) - a(n)·(q_1 n + ... + q_q n^q_deg) = a(n), i.e. q_0 fixed to 1.
+
+        Unknowns are ordered p_0..p_p_deg, q_1..q_q_deg (lowest power first).
+        """
+        n_pows, a_n_pows = self.columns(prime_array)
+        p = prime_array[:, None, None]
+        p_cols = n_pows[:, :fit_points, :p_deg + 1]
+        q_cols = (p - a_n_pows[:, :fit_points, 1:q_deg + 1]) % p
+        rhs = a_n_pows[:, :fit_points, :1]
+        return np.concatenate([p_cols, q_cols, rhs], axis=2)
+
+
+def test_rational_conjecture(sequence_data: SequenceLike, oeis_id: str, max_deg: int = 4) -> Dict[str, Any]:
     """
     Tests if a sequence can be described by a rational function P(n)/Q(n).
-    
+
     Tries to find polynomial coefficients for P and Q by solving the linear
-    system derived from a(n)Q(n) - P(n) = 0.
+    system derived from a(n)Q(n) - P(n) = 0 exactly over the rationals. Every
+    degree pair is a slice of one precomputed modular design matrix.
     """
+    sequence_data = SequenceView.of(sequence_data)
     n_sym = sympy.symbols('n')
-    
-    # Pre-check for large numbers
-    try:
-        _ = np.array(sequence_data, dtype=np.int64)
-    except OverflowError:
-        logging.warning(f"Sequence {oeis_id} contains numbers too large for rational fitting. Skipping.")
-        return {"status": "failed"}
 
     # We need enough points to solve for the coefficients.
     # For degrees (d_p, d_q), we need d_p + d_q + 2 points.
     # Max required is (max_deg + max_deg + 2).
     if len(sequence_data) < 2 * max_deg + 2:
         max_deg = (len(sequence_data) - 2) // 2
-    
+
     if max_deg < 0:
         return {"status": "failed"}
 
-    n_values = np.arange(1, len(sequence_data) + 1)
-    a_n_values = np.array(sequence_data)
+    # Two extra points beyond the unknowns make each solve an actual test.
+    design = _DesignMatrix(sequence_data, max_deg, min(len(sequence_data), 2 * max_deg + 4))
 
     # Iterate through possible degrees for numerator P(n) and denominator Q(n)
     for p_deg in range(max_deg + 1):
@@ -40,68 +83,31 @@ def test_rational_conjecture(sequence_data: List[int], oeis_id: str, max_deg: in
             if len(sequence_data) < num_coeffs:
                 continue
 
-            # Set up the linear system Ax = 0
-            # The columns correspond to coeffs of P then coeffs of Q
-            # [n^p_deg, ..., n, 1, -a(n)*n^q_deg, ..., -a(n)*n]
-            # We solve for Ax=b where one Q coeff is fixed to 1.
-            
-            M = []
-            b = []
-            
             fit_points = min(len(sequence_data), num_coeffs + 2) # Use extra points for a better fit
+            num_unknowns = p_deg + q_deg + 1
 
-            for i in range(fit_points):
-                n = n_values[i]
-                an = a_n_values[i]
-
-                p_row = [n**k for k in reversed(range(p_deg + 1))]
-                q_row = [-an * n**k for k in reversed(range(q_deg))] # Fixed q_0 = 1
-                
-                M.append(p_row + q_row)
-                b.append(an) # Corresponds to the fixed q_0 coefficient
-            
-            try:
-                # Use least squares to find the best-fit coefficients
-                coeffs, residuals, _, _ = np.linalg.lstsq(M, b, rcond=None)
-                if residuals.size > 0 and residuals[0] > 1e-5:
-                    continue
-
-            except np.linalg.LinAlgError:
+            # Solve exactly via modular elimination; the extra rows must be consistent.
+            coeffs = solve_augmented(
+                lambda prime_array: design.system(prime_array, p_deg, q_deg, fit_points), num_unknowns)
+            if coeffs is None:
                 continue
 
-            if not np.all(np.abs(coeffs - np.round(coeffs)) < 1e-9):
+            p_coeffs = coeffs[:p_deg + 1]
+            q_coeffs = [Fraction(1)] + coeffs[p_deg + 1:] # Add the fixed q_0=1
+
+            # Final verification, exact and vectorized over the whole sequence
+            if not verify_rational_function(p_coeffs, q_coeffs, sequence_data):
                 continue
 
-            rounded_coeffs = np.round(coeffs).astype(int)
-            
-            p_coeffs = list(rounded_coeffs[:p_deg + 1])
-            q_coeffs = list(rounded_coeffs[p_deg + 1:]) + [1] # Add the fixed q_0=1
-
-            P = sum(c * n_sym**k for c, k in zip(p_coeffs, reversed(range(p_deg + 1))))
-            Q = sum(c * n_sym**k for c, k in zip(q_coeffs, reversed(range(q_deg + 1))))
-            
-            if Q == 0: continue
-
-            # Final verification
-            is_verified = True
-            for i, true_val in enumerate(sequence_data, 1):
-                q_val = Q.subs(n_sym, i)
-                if q_val == 0: # Division by zero, invalid formula for this n
-                    is_verified = False
-                    break
-                predicted_val = P.subs(n_sym, i) / q_val
-                if abs(predicted_val - true_val) > 1e-9:
-                    is_verified = False
-                    break
-
-            if is_verified:
-                formula_latex = sympy.latex(P / Q)
-                logging.info(f"Verified rational conjecture for {oeis_id}: a(n) = {P}/{Q}")
-                return {
-                    "status": "verified",
-                    "type": "rational_function",
-                    "formula_latex": formula_latex,
-                    "details": f"Rational function with P(n) of degree {p_deg} and Q(n) of degree {q_deg}"
-                }
+            P = sum(sympy.Rational(c.numerator, c.denominator) * n_sym**k for k, c in enumerate(p_coeffs))
+            Q = sum(sympy.Rational(c.numerator, c.denominator) * n_sym**k for k, c in enumerate(q_coeffs))
+            formula_latex = sympy.latex(P / Q)
+            logging.info(f"Verified rational conjecture for {oeis_id}: a(n) = {P}/{Q}")
+            return {
+                "status": "verified",
+                "type": "rational_function",
+                "formula_latex": formula_latex,
+                "details": f"Rational function with P(n) of degree {p_deg} and Q(n) of degree {q_deg}"
+            }
 
     return {"status": "failed"}
@@ -0,0 +1,111 @@
+# src/core/result_store.py
+
+"""
+SQLite-backed store of conjecture test results.
+
+A result is keyed by (oeis_id, data hash, test label, engine version). The data hash
+is the SequenceView's content hash, so a changed b-file misses. The engine version
+hashes the test implementations and their configuration, so a code or settings change
+misses too. Only deterministic outcomes ("verified" and "failed") are stored. Errors
+and timeouts depend on the machine and the load, and are retried on the next run.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from types import ModuleType
+from typing import Any, Dict, Iterable, List
+
+# Outcomes that are a pure function of (data, engine) and therefore safe to reuse.
+STORABLE_STATUSES = ("verified", "failed")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    oeis_id        TEXT NOT NULL,
+    data_hash      TEXT NOT NULL,
+    test_label     TEXT NOT NULL,
+    engine_version TEXT NOT NULL,
+    status         TEXT NOT NULL,
+    result_json    TEXT NOT NULL,
+    elapsed_sec    REAL,
+    created_at     REAL NOT NULL,
+    PRIMARY KEY (oeis_id, data_hash, test_label, engine_version)
+)
+"""
+
+
+def engine_version(modules: Iterable[ModuleType], extra: str = "") -> str:
+    """Short hash of the given modules' source files plus any extra text (e.g. the config)."""
+    digest = hashlib.sha256()
+    for module in modules:
+        digest.update(module.__name__.encode("utf-8"))
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    digest.update(extra.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class ResultStore:
+    """
+    Results for one engine version. Safe to share between threads.
+
+    Opening the store drops rows written by other engine versions, since they can
+    never be hit again.
+    """
+
+    def __init__(self, path: str, version: str):
+        self.path = path
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.saved = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(_SCHEMA)
+            dropped = self._conn.execute("DELETE FROM results WHERE engine_version != ?", (version,)).rowcount
+        if dropped:
+            logging.info("Result store: dropped %d results from older engine versions.", dropped)
+
+    def lookup(self, oeis_id: str, data_hash: str, labels: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Stored results for the given labels, marked with "cached": True. Missing labels are omitted."""
+        if not labels:
+            return {}
+        placeholders = ",".join("?" * len(labels))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT test_label, result_json FROM results WHERE oeis_id = ? AND data_hash = ? "
+                f"AND engine_version = ? AND test_label IN ({placeholders})",
+                (oeis_id, data_hash, self.version, *labels)).fetchall()
+        found = {}
+        for label, result_json in rows:
+            result = json.loads(result_json)
+            result["cached"] = True
+            found[label] = result
+        self.hits += len(found)
+        self.misses += len(labels) - len(found)
+        return found
+
+    def save(self, oeis_id: str, data_hash: str, results: Dict[str, Dict[str, Any]]) -> None:
+        """Stores the deterministic, freshly computed results; cached and transient ones are skipped."""
+        rows = []
+        now = time.time()
+        for label, result in results.items():
+            if result.get("cached") or result.get("status") not in STORABLE_STATUSES:
+                continue
+            rows.append((oeis_id, data_hash, label, self.version, result["status"],
+                         json.dumps(result, default=str), result.get("elapsed_sec"), now))
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        self.saved += len(rows)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,337 @@
+# src/core/sandbox.py
+
+"""
+A persistent pool of worker subprocesses for running conjecture tests.
+
+Unlike a thread, a worker process can be killed: when a test overruns its deadline
+the worker is terminated, the caller gets an error result immediately, and a fresh
+worker replaces it for the next test. Workers are reused across candidates and can
+be capped in CPU time (RLIMIT_CPU, per test) and address space (RLIMIT_AS).
+A submitted test can also be cancelled: a queued one is dropped, a running one has
+its worker killed.
+"""
+
+import logging
+import math
+import multiprocessing
+import multiprocessing.forkserver
+import os
+import queue
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    import resource
+except ImportError:  # Not available on Windows; limits are skipped there.
+    resource = None
+
+# How often a waiting slot wakes up to check for a result or a cancellation.
+_POLL_INTERVAL_SEC = 0.1
+# CPU time a test may use beyond its wall-clock timeout, so that a single-threaded test
+# that overruns is reported as a timeout by its slot rather than killed by SIGXCPU.
+_CPU_LIMIT_MARGIN_SEC = 5
+
+
+def _mp_context(preload: Sequence[str] = ()):
+    """
+    Workers come from a fork server: a single-threaded process started before the first
+    worker, with `preload` already imported, that forks each worker (including the
+    replacements after a kill). Forking the analyzer itself mid-run would copy its
+    prefetch and report threads' locks, open SQLite connections and HTTP pools into
+    the worker. Spawn is the fallback where there is no fork server (Windows).
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    ctx = multiprocessing.get_context("forkserver")
+    ctx.set_forkserver_preload(list(preload))
+    # The fork server is a fresh interpreter that does not apply the sys.path it is sent
+    # (as of Python 3.11), so the preloaded modules would silently fail to import and
+    # every worker would import them again. It is started here with this process's
+    # sys.path as PYTHONPATH, which is restored right after.
+    saved = os.environ.get("PYTHONPATH")
+    os.environ["PYTHONPATH"] = os.pathsep.join(p for p in sys.path if p)
+    try:
+        multiprocessing.forkserver.ensure_running()
+    finally:
+        if saved is None:
+            del os.environ["PYTHONPATH"]
+        else:
+            os.environ["PYTHONPATH"] = saved
+    return ctx
+
+
+def _logging_config() -> Tuple[int, List[Tuple[str, Optional[str], int, Optional[str]]]]:
+    """
+    The root logger's level and its file and console handlers, as plain data a worker
+    can rebuild them from: (kind, filename, level, format) per handler.
+    """
+    root = logging.getLogger()
+    handlers = []
+    for handler in root.handlers:
+        fmt = handler.formatter._fmt if handler.formatter is not None else None
+        if isinstance(handler, logging.FileHandler):
+            handlers.append(("file", handler.baseFilename, handler.level, fmt))
+        elif isinstance(handler, logging.StreamHandler) and handler.stream in (sys.stderr, sys.stdout):
+            handlers.append(("stdout" if handler.stream is sys.stdout else "stderr", None, handler.level, fmt))
+    return root.level, handlers
+
+
+def _configure_logging(config: Tuple[int, List[Tuple[str, Optional[str], int, Optional[str]]]]) -> None:
+    level, handlers = config
+    root = logging.getLogger()
+    root.setLevel(level)
+    for kind, filename, handler_level, fmt in handlers:
+        if kind == "file":
+            handler: logging.Handler = logging.FileHandler(filename, mode="a", encoding="utf-8")
+        else:
+            handler = logging.StreamHandler(sys.stdout if kind == "stdout" else sys.stderr)
+        handler.setLevel(handler_level)
+        handler.setFormatter(logging.Formatter(fmt))
+        root.addHandler(handler)
+
+
+def _worker_main(conn, memory_limit_mb: Optional[int], log_config) -> None:
+    """Worker loop: receive (fn, args, cpu_limit_sec), run it, send back ("ok", result) or ("exc", trace)."""
+    _configure_logging(log_config)
+    if resource is not None and memory_limit_mb:
+        limit = memory_limit_mb * 1024 * 1024
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            return
+        if msg is None:
+            return
+        fn, args, cpu_limit_sec = msg
+        if resource is not None and cpu_limit_sec:
+            # RLIMIT_CPU is cumulative for the process, so the soft limit is moved to
+            # "CPU used so far + budget" before each test. Exceeding it raises SIGXCPU,
+            # which terminates the worker.
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            used = int(usage.ru_utime + usage.ru_stime) + 1
+            _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+            soft = used + cpu_limit_sec
+            if hard != resource.RLIM_INFINITY:
+                soft = min(soft, hard)
+            resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+        try:
+            payload = ("ok", fn(*args))
+        except MemoryError:
+            payload = ("exc", "MemoryError: test exceeded the worker memory limit")
+        except BaseException:
+            payload = ("exc", traceback.format_exc())
+        try:
+            conn.send(payload)
+        except Exception:
+            conn.send(("exc", traceback.format_exc()))
+
+
+class _Task:
+    __slots__ = ("label", "fn", "args", "timeout_sec", "future", "started", "cancel_requested")
+
+    def __init__(self, label: str, fn: Callable, args: Tuple, timeout_sec: Union[float, Callable[[], float]]):
+        self.label = label
+        self.fn = fn
+        self.args = args
+        self.timeout_sec = timeout_sec
+        self.future: Future = Future()
+        self.started = False
+        self.cancel_requested = False
+
+
+class _Worker:
+    """One subprocess plus the parent's end of its pipe."""
+
+    def __init__(self, ctx, memory_limit_mb: Optional[int], log_config):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, memory_limit_mb, log_config),
+                                   daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def kill(self) -> None:
+        self.process.terminate()
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(1)
+        self.conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except Exception:
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+
+class TestSandbox:
+    """
+    Runs test callables in reusable worker subprocesses with hard deadlines.
+
+    submit() returns a Future that always resolves to a result dict; timeouts,
+    crashes and resource-limit kills become {"status": "error", ...} results and
+    cancel() resolves it to {"status": "cancelled"}. Each result carries the test's
+    wall-clock running time as "elapsed_sec".
+
+    The timeout may be a callable, evaluated when the test starts; if it returns zero
+    or less the test is not run and resolves to {"status": "deferred"}. The per-test
+    CPU cap is raised to the timeout (plus a margin) when the timeout is longer.
+    """
+
+    def __init__(self, num_workers: int, cpu_limit_sec: Optional[int] = None,
+                 memory_limit_mb: Optional[int] = None, preload: Sequence[str] = ()):
+        self.num_workers = max(1, num_workers)
+        self.cpu_limit_sec = cpu_limit_sec
+        self.memory_limit_mb = memory_limit_mb
+        self.stats: Dict[str, int] = {"tasks": 0, "timeouts": 0, "crashes": 0, "cancelled": 0,
+                                      "deferred": 0, "workers_started": 0}
+        self._ctx = _mp_context(preload)
+        self._log_config = _logging_config()
+        self._tasks: "queue.Queue[Optional[_Task]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._live: Dict[Future, _Task] = {}
+        self._slots = [threading.Thread(target=self._slot_loop, name=f"sandbox-slot-{i}", daemon=True)
+                       for i in range(self.num_workers)]
+        for slot in self._slots:
+            slot.start()
+
+    def __enter__(self) -> "TestSandbox":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def submit(self, label: str, fn: Callable, args: Tuple,
+               timeout_sec: Union[float, Callable[[], float]]) -> Future:
+        task = _Task(label, fn, args, timeout_sec)
+        with self._lock:
+            self._live[task.future] = task
+        self._tasks.put(task)
+        return task.future
+
+    def cancel(self, future: Future) -> None:
+        """
+        Cancels a submitted test. A queued test resolves to "cancelled" immediately;
+        a running one is resolved by its slot, which kills the worker within one poll.
+        """
+        with self._lock:
+            task = self._live.get(future)
+            if task is None:
+                return
+            task.cancel_requested = True
+            if task.started:
+                return
+            del self._live[future]
+            self.stats["cancelled"] += 1
+        future.set_result({"status": "cancelled", "elapsed_sec": 0.0})
+
+    def close(self) -> None:
+        """Stops all workers; queued tasks that have not started are cancelled."""
+        while True:
+            try:
+                task = self._tasks.get_nowait()
+            except queue.Empty:
+                break
+            if task is not None:
+                task.future.cancel()
+        for _ in self._slots:
+            self._tasks.put(None)
+        for slot in self._slots:
+            slot.join()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _start_worker(self) -> _Worker:
+        self._count("workers_started")
+        return _Worker(self._ctx, self.memory_limit_mb, self._log_config)
+
+    def _slot_loop(self) -> None:
+        worker: Optional[_Worker] = None
+        try:
+            while True:
+                # (Re)started before waiting, so the worker boots while the slot is idle.
+                if worker is None or not worker.process.is_alive():
+                    worker = self._start_worker()
+                task = self._tasks.get()
+                if task is None:
+                    return
+                with self._lock:
+                    if task.cancel_requested:
+                        continue
+                    task.started = True
+                if not task.future.set_running_or_notify_cancel():
+                    continue
+                timeout = task.timeout_sec() if callable(task.timeout_sec) else task.timeout_sec
+                started = time.monotonic()
+                if timeout <= 0:
+                    self._count("deferred")
+                    result = {"status": "deferred"}
+                else:
+                    self._count("tasks")
+                    result, worker_ok = self._run(worker, task, timeout)
+                    if not worker_ok:
+                        worker.kill()
+                        worker = None
+                with self._lock:
+                    self._live.pop(task.future, None)
+                result["elapsed_sec"] = time.monotonic() - started
+                task.future.set_result(result)
+        finally:
+            if worker is not None:
+                worker.stop()
+
+    def _run(self, worker: _Worker, task: _Task, timeout_sec: float) -> Tuple[Dict[str, Any], bool]:
+        """Runs one task; returns (result dict, whether the worker is still usable)."""
+        label = task.label
+        cpu_limit_sec = None
+        if self.cpu_limit_sec:
+            # Never below the wall-clock timeout: a longer timeout (e.g. from the run
+            # budget) raises the CPU cap for this test instead of being cut short by it.
+            cpu_limit_sec = max(self.cpu_limit_sec, math.ceil(timeout_sec)) + _CPU_LIMIT_MARGIN_SEC
+        try:
+            worker.conn.send((task.fn, task.args, cpu_limit_sec))
+        except Exception:
+            return {"status": "error", "error": f"{label} could not be sent to a worker",
+                    "trace": traceback.format_exc()}, False
+
+        deadline = time.monotonic() + timeout_sec
+        while True:
+            if task.cancel_requested:
+                self._count("cancelled")
+                return {"status": "cancelled"}, False
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._count("timeouts")
+                logging.debug("Killing worker %s: %s exceeded %.1fs.", worker.process.pid, label, timeout_sec)
+                return {"status": "error", "error": f"{label} timed out after {round(timeout_sec, 1):g}s (killed)"}, False
+            try:
+                ready = worker.conn.poll(min(remaining, _POLL_INTERVAL_SEC))
+                if not ready:
+                    continue
+                kind, payload = worker.conn.recv()
+            except (EOFError, OSError):
+                self._count("crashes")
+                worker.process.join(1)
+                code = worker.process.exitcode
+                return {"status": "error",
+                        "error": f"{label} worker died (exit code {code}; CPU or memory limit exceeded?)"}, False
+            if kind == "ok":
+                if not isinstance(payload, dict):
+                    return {"status": "error", "error": f"{label} returned non-dict", "raw": str(payload)}, True
+                return payload, True
+            return {"status": "error", "error": f"{label} raised exception", "trace": payload}, True
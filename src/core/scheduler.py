@@ -0,0 +1,253 @@
+# src/core/scheduler.py
+
+"""
+Cost-aware scheduling of one candidate's conjecture tests.
+
+Tests are ordered by expected cost per success (mean running time divided by the
+observed success rate, with priors for tests that have not run yet), and a policy
+decides how much work is done once a formula is verified:
+
+- "all":      run every test to completion (the historical behaviour).
+- "cascade":  run tests one at a time, stop at the first verified formula.
+- "race":     run all tests at once, cancel the rest when one verifies.
+- "simplest": run all tests at once; when one verifies, cancel only the tests whose
+              formulas would be more complex, and keep the simplest verified one.
+
+Every policy except "all" reports at most one verified formula per candidate, so an
+n(n+1)/2 sequence no longer opens a polynomial, a recurrence and a rational PR.
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+POLICIES = ("all", "cascade", "race", "simplest")
+DEFAULT_POLICY = "simplest"
+
+# Lower is simpler; used by "simplest" to pick among equivalent verified formulas.
+SIMPLICITY_RANK = {
+    "polynomial": 0,
+    "exponential": 1,
+    "linear_recurrence": 2,
+    "rational_generating_function": 3,
+    "rational_function": 4,
+    "holonomic_recurrence": 5,
+}
+
+# Prior mean running times (seconds) on a typical b-file, before anything is measured.
+# Measured times are recorded divided by the sequence's cost scale (core/budget.py),
+# so all costs here refer to a reference-sized sequence.
+DEFAULT_COST_SEC = {
+    "polynomial": 0.02,
+    "exponential": 0.05,
+    "linear_recurrence": 0.05,
+    "rational_generating_function": 0.2,
+    "rational_function": 0.3,
+    "holonomic_recurrence": 2.0,
+}
+
+
+def parse_test_policy(entries: List[str], default: str = DEFAULT_POLICY) -> Tuple[str, List[str]]:
+    """
+    Splits an optional "policy:" prefix off the first ENABLE_TESTS entry.
+
+    "cascade:poly,exp,rec" -> ("cascade", ["poly", "exp", "rec"]); without a prefix the
+    default policy applies. An unknown policy is logged and replaced by the default.
+    """
+    if not entries or ":" not in entries[0]:
+        return default, list(entries)
+    policy, first = (part.strip() for part in entries[0].split(":", 1))
+    rest = ([first] if first else []) + list(entries[1:])
+    policy = policy.lower()
+    if policy not in POLICIES:
+        logging.warning("Unknown test policy %r in ENABLE_TESTS; using %r.", policy, default)
+        policy = default
+    return policy, rest
+
+
+def simplicity(label: str) -> int:
+    return SIMPLICITY_RANK.get(label, len(SIMPLICITY_RANK))
+
+
+class TestStats:
+    """
+    Per-test running time and success counts, optionally persisted as JSON between runs.
+
+    Thread-safe: completions are recorded from the sandbox's slot threads.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._stats = json.load(f)
+            except Exception as e:
+                logging.debug("Could not load scheduler stats from %s: %s", path, e)
+
+    def record(self, label: str, elapsed_sec: float, verified: bool) -> None:
+        with self._lock:
+            entry = self._stats.setdefault(label, {"runs": 0, "total_sec": 0.0, "verified": 0})
+            entry["runs"] += 1
+            entry["total_sec"] += elapsed_sec
+            entry["verified"] += int(verified)
+
+    def expected_cost(self, label: str) -> float:
+        """Mean running time, with the prior counted as one observation."""
+        entry = self._stats.get(label, {})
+        prior = DEFAULT_COST_SEC.get(label, 1.0)
+        return (prior + entry.get("total_sec", 0.0)) / (1 + entry.get("runs", 0))
+
+    def success_rate(self, label: str) -> float:
+        """Laplace-smoothed fraction of runs that verified a formula."""
+        entry = self._stats.get(label, {})
+        return (entry.get("verified", 0) + 1) / (entry.get("runs", 0) + 2)
+
+    def order(self, labels: List[str], policy: str) -> List[str]:
+        """Submission order: by simplicity for "simplest", else by expected cost per success."""
+        if policy == "simplest":
+            return sorted(labels, key=lambda lbl: (simplicity(lbl), self.expected_cost(lbl)))
+        return sorted(labels, key=lambda lbl: self.expected_cost(lbl) / self.success_rate(lbl))
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with self._lock:
+                data = json.dumps(self._stats, indent=2, sort_keys=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.write(data)
+        except Exception as e:
+            logging.debug("Could not save scheduler stats to %s: %s", self.path, e)
+
+
+def select_simplest(results: Dict[str, Dict[str, Any]], policy: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Keeps at most one verified result (the simplest) unless the policy is "all".
+
+    Other verified results become {"status": "superseded", "by": label}; the input is not modified.
+    """
+    verified = [lbl for lbl, res in results.items() if res.get("status") == "verified"]
+    if policy == "all" or len(verified) < 2:
+        return results
+    keep = min(verified, key=simplicity)
+    out = dict(results)
+    for lbl in verified:
+        if lbl != keep:
+            out[lbl] = {"status": "superseded", "by": keep}
+    return out
+
+
+class CandidateSchedule:
+    """
+    Drives one candidate's tests through a sandbox according to a policy.
+
+    start() submits the initial tests; completions arrive as Future callbacks, which
+    record timings, submit the next test (cascade) and cancel tests that can no longer
+    matter. wait() blocks until the candidate is decided and returns one result per
+    label, before select_simplest() is applied.
+
+    `known` holds results that are already available (e.g. from the result store);
+    those tests are not run, but a known verified formula still stops the others.
+    `timeout_sec` is either fixed or a function of the label, evaluated when the test starts.
+    Running times are recorded in TestStats divided by `cost_scale`.
+    """
+
+    def __init__(self, sandbox, policy: str, plan: List[Tuple[str, Callable]], args: Tuple,
+                 timeout_sec: Union[float, Callable[[str], float]], stats: TestStats,
+                 known: Optional[Dict[str, Dict[str, Any]]] = None, cost_scale: float = 1.0):
+        self.sandbox = sandbox
+        self.policy = policy
+        self.fns = dict(plan)
+        self.args = args
+        self.timeout_sec = timeout_sec
+        self.cost_scale = cost_scale
+        self.stats = stats
+        self.results: Dict[str, Dict[str, Any]] = dict(known or {})
+        self.order = stats.order([label for label, _ in plan if label not in self.results], policy)
+        self._total = len(self.results) + len(self.order)
+        self._futures: Dict[str, Future] = {}
+        self._next = 0
+        self._best: Optional[str] = None
+        for label, res in self.results.items():
+            if res.get("status") == "verified" and (self._best is None or simplicity(label) < simplicity(self._best)):
+                self._best = label
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    def start(self) -> "CandidateSchedule":
+        with self._lock:
+            if self._best is not None and self.policy != "all":
+                # Only "simplest" still has work: tests that could beat the known formula.
+                todo = [lbl for lbl in self.order
+                        if self.policy == "simplest" and simplicity(lbl) < simplicity(self._best)]
+                for label in self.order:
+                    if label not in todo:
+                        self.results[label] = {"status": "skipped", "reason": f"{self._best} verified"}
+                self.order = todo
+                self._total = len(self.results) + len(todo)
+            initial = 1 if self.policy == "cascade" else len(self.order)
+            to_submit = self._take(initial)
+            finished = len(self.results) == self._total
+        self._submit(to_submit)
+        if finished:
+            self._done.set()
+        return self
+
+    def wait(self) -> Dict[str, Dict[str, Any]]:
+        self._done.wait()
+        return self.results
+
+    def _take(self, count: int) -> List[str]:
+        labels = self.order[self._next:self._next + count]
+        self._next += len(labels)
+        return labels
+
+    def _submit(self, labels: List[str]) -> None:
+        for label in labels:
+            timeout = functools.partial(self.timeout_sec, label) if callable(self.timeout_sec) else self.timeout_sec
+            fut = self.sandbox.submit(label, self.fns[label], self.args, timeout)
+            with self._lock:
+                self._futures[label] = fut
+            fut.add_done_callback(lambda f, label=label: self._on_done(label, f))
+
+    def _on_done(self, label: str, fut: Future) -> None:
+        try:
+            res = fut.result()
+        except Exception as e:
+            res = {"status": "error", "error": f"{label} future raised: {e}"}
+        status = res.get("status")
+        if status not in ("cancelled", "deferred"):
+            self.stats.record(label, res.get("elapsed_sec", 0.0) / self.cost_scale, status == "verified")
+
+        to_submit: List[str] = []
+        to_cancel: List[Future] = []
+        with self._lock:
+            self.results[label] = res
+            if status == "verified" and (self._best is None or simplicity(label) < simplicity(self._best)):
+                self._best = label
+            if self._best is not None and self.policy != "all":
+                # Anything not submitted yet is skipped; running tests are cancelled
+                # unless "simplest" could still prefer their formula.
+                for other in self._take(len(self.order)):
+                    self.results[other] = {"status": "skipped", "reason": f"{self._best} verified"}
+                for other, other_fut in self._futures.items():
+                    if other in self.results or other_fut.done():
+                        continue
+                    if self.policy != "simplest" or simplicity(other) > simplicity(self._best):
+                        to_cancel.append(other_fut)
+            elif self.policy == "cascade":
+                to_submit = self._take(1)
+            finished = len(self.results) == self._total
+        for other_fut in to_cancel:
+            self.sandbox.cancel(other_fut)
+        self._submit(to_submit)
+        if finished:
+            self._done.set()
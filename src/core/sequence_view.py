@@ -0,0 +1,144 @@
+# src/core/sequence_view.py
+
+"""
+A per-candidate view of a sequence that every conjecture test can share.
+
+The analyzer builds one SequenceView per candidate and hands the same object to all
+enabled tests, so the int64/bigint classification, the array conversion and any
+derived data (index values, difference tables, residues modulo the prime batch) are
+computed at most once. Derived data is computed lazily on first use.
+
+A sandboxed test gets its own unpickled copy of the view. Only the terms are pickled,
+so the copy starts with empty caches and fills them for that test alone.
+"""
+
+import hashlib
+import numpy as np
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from core.linalg import exact_array, residues as reduce_residues
+
+# Entries below this magnitude can be differenced once more without leaving int64.
+_DIFF_SAFE_BOUND = 1 << 61
+# exact_array() keeps int64 only below this magnitude.
+_INT64_ARRAY_BOUND = 1 << 62
+
+
+class SequenceView:
+    """
+    Array-backed, read-only representation of a sequence's terms.
+
+    Behaves like the original list for indexing, slicing (which returns plain lists),
+    len() and iteration, so code written against List[int] keeps working. The terms
+    are held only in `array` (int64, or Python ints in an object array); lists are
+    derived from it on demand.
+    """
+
+    def __init__(self, terms: Union[Sequence[int], np.ndarray], oeis_id: Optional[str] = None):
+        self.oeis_id = oeis_id
+        if isinstance(terms, np.ndarray) and terms.dtype == np.int64 and terms.ndim == 1:
+            # Arrays (e.g. read from the sequence cache) are used as they are, without a copy.
+            self.max_abs = max(int(terms.max()), -int(terms.min())) if len(terms) else 0
+            self.array = terms if self.max_abs < _INT64_ARRAY_BOUND else terms.astype(object)
+        else:
+            terms = [int(t) for t in terms]
+            self.array = exact_array(terms)
+            self.max_abs = max((abs(t) for t in terms), default=0)
+        self.dtype_class = "int64" if self.array.dtype == np.int64 else "bigint"
+        self._reset_caches()
+
+    def _reset_caches(self) -> None:
+        self._differences: List[np.ndarray] = [self.array]
+        self._residues: Dict[Tuple[int, ...], np.ndarray] = {}
+        self._content_hash: Optional[str] = None
+        self._n_values: Optional[np.ndarray] = None
+
+    def __getstate__(self) -> Dict[str, object]:
+        return {"oeis_id": self.oeis_id, "array": self.array, "dtype_class": self.dtype_class,
+                "max_abs": self.max_abs}
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._reset_caches()
+
+    @classmethod
+    def of(cls, data: "SequenceLike") -> "SequenceView":
+        """Returns data unchanged if it is already a view, else wraps it."""
+        return data if isinstance(data, SequenceView) else cls(data)
+
+    # --- List-like behaviour ---
+
+    def __len__(self) -> int:
+        return len(self.array)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.array[index].tolist()
+        return int(self.array[index])
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.array.tolist())
+
+    def tolist(self) -> List[int]:
+        """The terms as a new list of Python ints."""
+        return self.array.tolist()
+
+    def __repr__(self) -> str:
+        return f"SequenceView(oeis_id={self.oeis_id!r}, length={len(self)}, dtype={self.dtype_class})"
+
+    # --- Shared precomputation ---
+
+    @property
+    def is_int64(self) -> bool:
+        return self.dtype_class == "int64"
+
+    @property
+    def n_values(self) -> np.ndarray:
+        """The 1-based indices n = 1..len as an int64 array."""
+        if self._n_values is None:
+            self._n_values = np.arange(1, len(self) + 1, dtype=np.int64)
+        return self._n_values
+
+    @property
+    def content_hash(self) -> str:
+        """SHA-256 of the terms; identifies the data independently of where it came from."""
+        if self._content_hash is None:
+            digest = hashlib.sha256(",".join(map(str, self.tolist())).encode("ascii"))
+            self._content_hash = digest.hexdigest()
+        return self._content_hash
+
+    def difference(self, k: int) -> np.ndarray:
+        """
+        The k-th forward differences, extending the cached table as needed.
+
+        A row stays int64 while the next difference provably cannot overflow and
+        switches to Python ints otherwise.
+        """
+        while len(self._differences) <= k:
+            row = self._differences[-1]
+            if len(row) < 2:
+                return row[:0]
+            if row.dtype != object and np.abs(row).max() >= _DIFF_SAFE_BOUND:
+                row = row.astype(object)
+            self._differences.append(np.diff(row))
+        return self._differences[k]
+
+    def residues(self, prime_array: np.ndarray, length: Optional[int] = None) -> np.ndarray:
+        """
+        Residues of the first `length` terms (default: all) modulo each prime, shape (P, length).
+
+        Cached per prime batch. Any cached batch that starts with these primes and covers
+        at least `length` terms serves the request, so a single-prime screen reuses the
+        rows of a larger batch.
+        """
+        length = len(self) if length is None else min(length, len(self))
+        key = tuple(int(p) for p in prime_array)
+        for cached_key, cached in list(self._residues.items()):
+            if cached_key[:len(key)] == key and cached.shape[1] >= length:
+                return cached[:len(key), :length]
+        res = reduce_residues(self.array[:length], prime_array)
+        self._residues[key] = res
+        return res
+
+
+SequenceLike = Union[List[int], SequenceView]
@@ -0,0 +1,113 @@
+# src/core/sharding.py
+
+"""
+Static sharding of the candidate list across independent runners.
+
+A candidate belongs to shard crc32(oeis_id) mod N, which depends only on the ID, so
+every runner computes the same partition without coordinating and a candidate keeps
+its shard when the list grows. Each shard writes its own summary file, and the files
+are merged afterwards with merge_summaries().
+"""
+
+import json
+import logging
+import os
+import zlib
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+
+class Shard(NamedTuple):
+    """Shard `index` (0-based) of `count`."""
+    index: int
+    count: int
+
+    def owns(self, oeis_id: str) -> bool:
+        return shard_of(oeis_id, self.count) == self.index
+
+    def filter(self, oeis_ids: Iterable[str]) -> List[str]:
+        return [oeis_id for oeis_id in oeis_ids if self.owns(oeis_id)]
+
+    @property
+    def label(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    @property
+    def suffix(self) -> str:
+        return f"shard-{self.index}-of-{self.count}"
+
+
+def shard_of(oeis_id: str, count: int) -> int:
+    """Stable shard number of an ID (unlike hash(), independent of PYTHONHASHSEED)."""
+    return zlib.crc32(oeis_id.strip().encode("utf-8")) % count
+
+
+def parse_shard(spec: Optional[str]) -> Optional[Shard]:
+    """Parses "i/N" with 0 <= i < N; None or "" means unsharded. Raises ValueError otherwise."""
+    if not spec:
+        return None
+    try:
+        index, count = (int(part) for part in spec.split("/"))
+    except ValueError:
+        raise ValueError(f"Invalid shard {spec!r}; expected i/N, e.g. 0/4")
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"Invalid shard {spec!r}; need 0 <= i < N")
+    return None if count == 1 else Shard(index, count)
+
+
+def shard_from_env() -> Optional[str]:
+    """The "i/N" spec from SHARD_INDEX and SHARD_COUNT, or None if they are not both set."""
+    index, count = os.getenv("SHARD_INDEX"), os.getenv("SHARD_COUNT")
+    if index is None or count is None:
+        return None
+    return f"{index.strip()}/{count.strip()}"
+
+
+def shard_path(path: str, shard: Optional[Shard]) -> str:
+    """data/x.json -> data/x.shard-1-of-4.json; unchanged when unsharded."""
+    if shard is None:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{shard.suffix}{ext}"
+
+
+def _add_metrics(total: Dict[str, Any], part: Dict[str, Any]) -> None:
+    for key, value in part.items():
+        if isinstance(value, dict):
+            _add_metrics(total.setdefault(key, {}), value)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            total[key] = total.get(key, 0) + value
+
+
+def merge_summaries(paths: List[str]) -> Dict[str, Any]:
+    """
+    Combines per-shard summary files: metrics are summed, candidate and deferred lists concatenated.
+
+    Logs a warning if the files do not cover every shard of one partition exactly once.
+    """
+    merged: Dict[str, Any] = {"shards": [], "metrics": {}, "deferred": [], "candidates": [], "elapsed_sec": 0.0}
+    counts = set()
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            part = json.load(f)
+        merged["shards"].append(part.get("shard"))
+        if part.get("shard"):
+            counts.add(parse_shard(part["shard"]).count)
+        _add_metrics(merged["metrics"], part.get("metrics", {}))
+        merged["deferred"].extend(part.get("deferred", []))
+        merged["candidates"].extend(part.get("candidates", []))
+        merged["elapsed_sec"] = max(merged["elapsed_sec"], part.get("elapsed_sec", 0.0))
+        for key in ("engine_version", "run_id"):
+            if key in part:
+                merged.setdefault(key, part[key])
+    merged["candidates"].sort(key=lambda c: c.get("oeis_id", ""))
+
+    if len(counts) > 1:
+        logging.warning("Merging summaries from different shard counts: %s", sorted(counts))
+    elif counts:
+        count = counts.pop()
+        expected = {f"{i}/{count}" for i in range(count)}
+        seen = [s for s in merged["shards"] if s]
+        if set(seen) != expected or len(seen) != count:
+            logging.warning("Shard summaries cover %s; expected each of %s once.",
+                            sorted(seen), sorted(expected))
+    return merged
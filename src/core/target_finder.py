@@ -4,12 +4,22 @@ import requests
 import json
 import re
 import logging
+import multiprocessing
 import time
-from typing import List, Optional, Dict
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple, Union
+
+from core.rate_limit import THROTTLE_STATUSES, AdaptiveRateLimiter, parse_retry_after
 
 OEIS_HOMEPAGE_URL = "https://oeis.org/"
 OEIS_SEARCH_URL = "https://oeis.org/search"
 OEIS_BFILE_URL_TEMPLATE = "https://oeis.org/{oeis_id}/b{oeis_id_num}.txt"
+# Results per page of the JSON search API (fixed by the server).
+SEARCH_PAGE_SIZE = 10
+# Search pages fetched at once, and the rate limit shared by all of them.
+SEARCH_CONCURRENCY = 4
+SEARCH_RATE_PER_SEC = 2.0
 
 def _create_oeis_session() -> requests.Session:
     """
@@ -21,6 +31,9 @@ def _create_oeis_session() -> requests.Session:
     session.headers.update({
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     })
+    if multiprocessing.current_process().name != "MainProcess":
+        # Sandbox workers re-import the main module but never talk to the OEIS.
+        return session
     try:
         logging.info("Performing warm-up request to OEIS homepage to establish a session...")
         response = session.get(OEIS_HOMEPAGE_URL, timeout=15)
@@ -35,71 +48,172 @@ def _create_oeis_session() -> requests.Session:
 # This is more efficient and correctly maintains the session state.
 oeis_session = _create_oeis_session()
 
-def find_candidate_sequences(search_query: str, count: int) -> List[str]:
+def _search_page(query: str, start: int, limiter: AdaptiveRateLimiter, retries: int = 3) -> Optional[List[str]]:
+    """
+    IDs on one page of search results ([] past the last page), or None if the page
+    could not be fetched. Throttled responses slow the shared limiter and are retried.
+    """
+    params = {"q": query, "fmt": "json", "start": start}
+    for attempt in range(1, retries + 1):
+        limiter.acquire()
+        try:
+            # Use the pre-warmed session object for the request
+            response = oeis_session.get(OEIS_SEARCH_URL, params=params, timeout=20)
+            if response.status_code in THROTTLE_STATUSES:
+                limiter.on_throttle(parse_retry_after(response.headers.get("Retry-After")))
+                logging.warning(f"Search for '{query}' (start={start}) throttled with HTTP {response.status_code}; "
+                                f"attempt {attempt}/{retries}.")
+                continue
+            response.raise_for_status()
+            data = response.json()
+        except requests.exceptions.HTTPError as e:
+            logging.error(f"HTTP Error searching OEIS: {e}. The server may be blocking our requests.")
+            return None
+        except requests.exceptions.RequestException as e:
+            logging.warning(f"Failed to search OEIS (attempt {attempt}/{retries}): {e}")
+            continue
+        except json.JSONDecodeError:
+            logging.error("Failed to decode JSON response from OEIS search API.")
+            return None
+        limiter.on_success()
+        # The JSON API returns either a list of results or {"results": [...]}; null when empty.
+        results = data.get("results") if isinstance(data, dict) else data
+        return [f"A{result['number']:06d}" for result in results or []]
+    return None
+
+
+def harvest_candidates(search_queries: Union[str, Sequence[str]], count: int,
+                       known: Optional[Set[str]] = None, keep: Optional[Callable[[str], bool]] = None,
+                       concurrency: int = SEARCH_CONCURRENCY,
+                       rate_per_sec: float = SEARCH_RATE_PER_SEC) -> Iterator[Tuple[str, str]]:
     """
-    Searches the OEIS database using a given query string via its JSON API.
+    Pages through the search results of every query and yields (oeis_id, query) for up
+    to `count` new IDs, deduplicated across queries.
+
+    Pages of all queries are fetched concurrently under one rate limiter, a few pages
+    ahead per query, and processed in page order. A query stops at its last page or
+    at the first page with nothing new: only IDs that are `known` or rejected by `keep`
+    (e.g. a shard filter).
+    """
+    queries = [search_queries] if isinstance(search_queries, str) else list(search_queries)
+    known = known or set()
+    limiter = AdaptiveRateLimiter(rate_per_sec, burst=concurrency)
+    window = max(1, concurrency // max(len(queries), 1))
+    seen: Set[str] = set()
+    next_start = {query: 0 for query in queries}
+    in_flight: Dict[str, Deque[Tuple[int, Future]]] = {query: deque() for query in queries}
+    found = 0
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="search") as ex:
+        try:
+            while in_flight and found < count:
+                for query, pages in in_flight.items():
+                    while len(pages) < window:
+                        pages.append((next_start[query], ex.submit(_search_page, query, next_start[query], limiter)))
+                        next_start[query] += SEARCH_PAGE_SIZE
+                wait([pages[0][1] for pages in in_flight.values()], return_when=FIRST_COMPLETED)
+                for query in list(in_flight):
+                    pages = in_flight[query]
+                    while pages and pages[0][1].done() and query in in_flight:
+                        start, fut = pages.popleft()
+                        ids = fut.result()
+                        wanted = [oeis_id for oeis_id in ids or []
+                                  if oeis_id not in known and (keep is None or keep(oeis_id))]
+                        if not wanted:
+                            reason = "could not be fetched" if ids is None else "is empty" if not ids else "has only known IDs"
+                            logging.info(f"Search '{query}': stopping at start={start}; the page {reason}.")
+                            for _, pending in in_flight.pop(query):
+                                pending.cancel()
+                            break
+                        for oeis_id in wanted:
+                            if oeis_id in seen or found >= count:
+                                continue
+                            seen.add(oeis_id)
+                            found += 1
+                            yield oeis_id, query
+        finally:
+            for pages in in_flight.values():
+                for _, fut in pages:
+                    fut.cancel()
+    logging.info(f"OEIS search harvested {found} new candidate IDs from {len(queries)} queries.")
+
+
+def find_candidate_sequences(search_query: Union[str, Sequence[str]], count: int,
+                             known: Optional[Set[str]] = None) -> List[str]:
+    """
+    Searches the OEIS database using the given query string(s) via its JSON API.
+
+    Returns up to `count` IDs that are not `known`, paging through the results
+    concurrently (see harvest_candidates).
     """
     logging.info(f"Searching OEIS with query='{search_query}' and count={count}...")
-    params = {
-        "q": search_query,
-        "fmt": "json",
-        "n": count,
-        "start": 0
-    }
-    
-    new_ids = []
-    try:
-        # Use the pre-warmed session object for the request
-        response = oeis_session.get(OEIS_SEARCH_URL, params=params, timeout=20)
-        response.raise_for_status()
-        data = response.json()
-        
-        if "results" in data and data.get("results") is not None:
-            for result in data["results"]:
-                oeis_id = f"A{result['number']:06d}"
-                new_ids.append(oeis_id)
-            logging.info(f"OEIS search returned {len(new_ids)} new candidate IDs.")
-        else:
-            logging.info("OEIS search returned no results or an empty result set.")
-        return new_ids
-
-    except requests.exceptions.HTTPError as e:
-        logging.error(f"HTTP Error searching OEIS: {e}. The server may be blocking our requests.")
-        return []
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Failed to search OEIS: {e}")
-        return []
-    except json.JSONDecodeError:
-        logging.error("Failed to decode JSON response from OEIS search API.")
-        return []
+    return [oeis_id for oeis_id, _ in harvest_candidates(search_query, count, known)]
+
+def b_file_url(oeis_id: str) -> Optional[str]:
+    """URL of the b-file for an OEIS ID, or None if the ID is malformed."""
+    if not re.fullmatch(r"A\d{6,}", oeis_id):
+        return None
+    return OEIS_BFILE_URL_TEMPLATE.format(oeis_id=oeis_id, oeis_id_num=oeis_id[1:])
+
+class ParsedBFile(NamedTuple):
+    """Terms read from a b-file, the index n of the first one, and whether reading stopped early."""
+    terms: List[int]
+    offset: Optional[int]
+    truncated: bool
+
+def parse_b_file(lines: Iterable[str], max_terms: Optional[int] = None,
+                 max_digits: Optional[int] = None) -> ParsedBFile:
+    """
+    Terms from b-file lines of the form "n a(n)", consumed lazily so a stream can be abandoned early.
 
-def fetch_b_file_data(oeis_id: str) -> Optional[List[int]]:
+    Comments and malformed lines are skipped. Reading stops after `max_terms` terms,
+    before the total number of digits would exceed `max_digits`, and at a gap in the
+    indices or a term that cannot be parsed, since every later term would be shifted.
+    """
+    sequence_data: List[int] = []
+    offset = None
+    digits = 0
+    for line in lines:
+        parts = line.split()
+        if len(parts) < 2 or parts[0].startswith('#'):
+            continue
+        try:
+            n = int(parts[0])
+        except ValueError:
+            continue
+        if offset is None:
+            offset = n
+        if n != offset + len(sequence_data):
+            return ParsedBFile(sequence_data, offset, True)
+        if max_terms is not None and len(sequence_data) >= max_terms:
+            return ParsedBFile(sequence_data, offset, True)
+        digits += len(parts[1]) - parts[1].startswith('-')
+        if max_digits is not None and digits > max_digits:
+            return ParsedBFile(sequence_data, offset, True)
+        try:
+            sequence_data.append(int(parts[1]))
+        except ValueError:
+            return ParsedBFile(sequence_data, offset, True)
+    return ParsedBFile(sequence_data, offset, False)
+
+def fetch_b_file_data(oeis_id: str, max_terms: Optional[int] = None,
+                      max_digits: Optional[int] = None) -> Optional[List[int]]:
     """
     Fetches the b-file for a given OEIS ID using the shared session.
+
+    The response is streamed and parsed line by line, and the download stops at the
+    term and digit caps.
     """
-    if not re.fullmatch(r"A\d{6,}", oeis_id):
+    url = b_file_url(oeis_id)
+    if url is None:
         logging.warning(f"Invalid OEIS ID format passed to fetch_b_file_data: {oeis_id}")
         return None
 
-    oeis_id_num_part = oeis_id[1:]
-    url = OEIS_BFILE_URL_TEMPLATE.format(oeis_id=oeis_id, oeis_id_num=oeis_id_num_part)
-    
     try:
         # Use the same shared session to fetch the b-file
-        response = oeis_session.get(url, timeout=15)
-        response.raise_for_status()
-        
-        sequence_data = []
-        for line in response.text.splitlines():
-            if not line or line.startswith('#'):
-                continue
-            parts = line.strip().split()
-            if len(parts) >= 2:
-                try:
-                    a_n = int(parts[1])
-                    sequence_data.append(a_n)
-                except (ValueError, IndexError):
-                    continue
+        with oeis_session.get(url, timeout=15, stream=True) as response:
+            response.raise_for_status()
+            response.encoding = response.encoding or "utf-8"
+            sequence_data = parse_b_file(response.iter_lines(decode_unicode=True), max_terms, max_digits).terms
         
         if not sequence_data:
             logging.warning(f"B-file for {oeis_id} was empty or unparseable.")
@@ -0,0 +1,170 @@
+# src/core/verification.py
+
+"""
+Vectorized exact verification of candidate formulas.
+
+Every checker evaluates the candidate over the whole b-file in one NumPy call.
+Rational coefficients are cleared to integers first, and a magnitude bound picks
+the kernel: an int64 kernel when no intermediate value can overflow, an
+object-array kernel over Python ints otherwise. SymPy is never involved here, so
+callers only build symbolic objects for formulas that already passed.
+"""
+
+import math
+import numpy as np
+from fractions import Fraction
+from typing import List, Sequence, Tuple, Union
+
+from core.sequence_view import SequenceView
+
+# Intermediate values must stay below this bound to use the int64 kernels.
+INT64_SAFE_BOUND = 1 << 62
+
+Number = Union[int, Fraction]
+
+
+def _common_denominator(values: Sequence[Number]) -> int:
+    d = 1
+    for v in values:
+        d = math.lcm(d, Fraction(v).denominator)
+    return d
+
+
+def scale_to_integers(values: Sequence[Number]) -> Tuple[List[int], int]:
+    """Returns (integers, D) with integers[i] == values[i] * D for the smallest such D."""
+    d = _common_denominator(values)
+    return [int(Fraction(v) * d) for v in values], d
+
+
+def _max_abs(values) -> int:
+    if isinstance(values, SequenceView):
+        return values.max_abs
+    return max((abs(int(v)) for v in values), default=0)
+
+
+def _sequence_array(sequence: Sequence[int], scale: int, bound: int) -> np.ndarray:
+    """
+    The sequence times `scale`, as int64 when `bound` allows it and as Python ints otherwise.
+
+    A SequenceView's prebuilt array is reused instead of converting the terms again.
+    """
+    fits = bound < INT64_SAFE_BOUND and _max_abs(sequence) * abs(scale) < INT64_SAFE_BOUND
+    if isinstance(sequence, SequenceView):
+        base = sequence.array if fits or sequence.array.dtype == object else sequence.array.astype(object)
+        return base if scale == 1 else base * scale
+    if fits:
+        return np.asarray(sequence, dtype=np.int64) * scale
+    return np.array([int(v) * scale for v in sequence], dtype=object)
+
+
+def _index_values(sequence: Sequence[int], start: int, stop: int) -> np.ndarray:
+    """The indices n = start..stop-1 as int64, sliced from a SequenceView's shared 1-based n_values when possible."""
+    if isinstance(sequence, SequenceView) and 1 <= start and stop <= len(sequence) + 1:
+        return sequence.n_values[start - 1:stop - 1]
+    return np.arange(start, stop, dtype=np.int64)
+
+
+def horner(int_coeffs: Sequence[int], n_values: np.ndarray) -> np.ndarray:
+    """
+    Evaluates the integer polynomial Σ c_i n^i (lowest power first) at every n in one pass.
+
+    Uses an int64 Horner kernel when Σ|c_i|·max|n|^i provably fits, else object arithmetic.
+    """
+    n_max = _max_abs(n_values)
+    bound = sum(abs(c) * n_max**i for i, c in enumerate(int_coeffs))
+    if bound < INT64_SAFE_BOUND:
+        n_arr = np.asarray(n_values, dtype=np.int64)
+        acc = np.zeros(len(n_arr), dtype=np.int64)
+    else:
+        n_arr = np.array([int(v) for v in n_values], dtype=object)
+        acc = np.zeros(len(n_arr), dtype=object)
+    for c in reversed(int_coeffs):
+        acc = acc * n_arr + c
+    return acc
+
+
+def verify_rational_function(p_coeffs: Sequence[Number], q_coeffs: Sequence[Number],
+                             sequence: Sequence[int], start: int = 1) -> bool:
+    """
+    Checks a(n) == P(n)/Q(n) with Q(n) != 0 everywhere, comparing P(n) with a(n)·Q(n).
+
+    Coefficients are given lowest power first.
+    """
+    scaled, _ = scale_to_integers(list(p_coeffs) + list(q_coeffs))
+    p_int, q_int = scaled[:len(p_coeffs)], scaled[len(p_coeffs):]
+    n_values = _index_values(sequence, start, start + len(sequence))
+    p_vals = horner(p_int, n_values)
+    q_vals = horner(q_int, n_values)
+    if np.any(q_vals == 0):
+        return False
+    a_vals = _sequence_array(sequence, 1, 0)
+    bound = _max_abs(q_vals) * _max_abs(sequence)
+    if a_vals.dtype == object or q_vals.dtype == object or bound >= INT64_SAFE_BOUND:
+        a_vals, q_vals = a_vals.astype(object), q_vals.astype(object)
+    return bool(np.all(p_vals == a_vals * q_vals))
+
+
+def verify_linear_recurrence(coeffs: Sequence[int], sequence: Sequence[int], start_index: int = None) -> bool:
+    """
+    Checks a(i) == Σ_j coeffs[j-1]·a(i-j) for every index i >= start_index (default: the order).
+
+    The sum is formed as len(coeffs) shifted vector operations over the whole sequence.
+    """
+    k = len(coeffs)
+    start_index = k if start_index is None else start_index
+    if len(sequence) <= start_index:
+        return True
+    bound = sum(abs(c) for c in coeffs) * _max_abs(sequence)
+    arr = _sequence_array(sequence, 1, bound)
+    n = len(arr)
+    acc = np.zeros(n - start_index, dtype=arr.dtype)
+    for j, c in enumerate(coeffs, 1):
+        if c:
+            acc = acc + c * arr[start_index - j:n - j]
+    return bool(np.all(acc == arr[start_index:]))
+
+
+def verify_exponential_sum(terms: Sequence[Tuple[Number, int]], constant: Number,
+                           sequence: Sequence[int], start: int = 1) -> bool:
+    """Checks a(n) == Σ A_i·B_i^n + C for n = start, start+1, ... over the whole sequence."""
+    scaled, d = scale_to_integers([a for a, _ in terms] + [constant])
+    amplitudes, c_int = scaled[:-1], scaled[-1]
+    count = len(sequence)
+    last = start + count - 1
+    # Bit-length estimate of Σ|A_i|·|B_i|^last + |C| without materializing the powers.
+    bits = max([abs(a).bit_length() + last * abs(b).bit_length() for a, (_, b) in zip(amplitudes, terms)]
+               + [abs(c_int).bit_length()]) + len(terms).bit_length()
+    use_int64 = bits < 62
+    dtype = np.int64 if use_int64 else object
+    acc = np.full(count, c_int, dtype=dtype)
+    for a, (_, base) in zip(amplitudes, terms):
+        factors = np.full(count, base, dtype=dtype)
+        factors[0] = base**start
+        acc = acc + a * np.cumprod(factors)
+    expected = _sequence_array(sequence, d, 0 if use_int64 else INT64_SAFE_BOUND)
+    return bool(np.all(acc == expected))
+
+
+def verify_holonomic_recurrence(polys: Sequence[Sequence[int]], sequence: Sequence[int],
+                                start_index: int = None) -> bool:
+    """
+    Checks Σ_i p_i(n)·a(n-i) == 0 for every index >= start_index (default: the order).
+
+    polys[i] holds the integer coefficients of p_i, lowest power first, and n is the
+    1-based index of the term a(n).
+    """
+    order = len(polys) - 1
+    start_index = order if start_index is None else start_index
+    count = len(sequence)
+    if count <= start_index:
+        return True
+    n_values = _index_values(sequence, start_index + 1, count + 1)
+    poly_vals = [horner(p, n_values) for p in polys]
+    bound = (order + 1) * max(_max_abs(v) for v in poly_vals) * _max_abs(sequence)
+    arr = _sequence_array(sequence, 1, bound)
+    if arr.dtype == object:
+        poly_vals = [v.astype(object) for v in poly_vals]
+    acc = np.zeros(count - start_index, dtype=arr.dtype)
+    for i, vals in enumerate(poly_vals):
+        acc = acc + vals * arr[start_index - i:count - i]
+    return bool(np.all(acc == 0))
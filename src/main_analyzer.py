@@ -1,24 +1,41 @@
 # src/main_analyzer.py
 
+import argparse
+import functools
 import json
 import os
 import re
 import time
 import logging
+import queue
+import threading
 import traceback
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple, Union
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, TimeoutError
 
 # --- Import Core Modules ---
 from core.conjecture_engine import (
     test_polynomial_conjecture,
     test_linear_recurrence_conjecture,
-    test_exponential_conjecture
+    test_exponential_conjecture,
+    test_holonomic_conjecture,
+    test_rational_gf_conjecture
 )
 # <-- ADDED IMPORT: Import the new rational conjecture test
 from core.rational_conjecture import test_rational_conjecture
-from core.target_finder import fetch_b_file_data
+from core.sandbox import TestSandbox
+from core.scheduler import CandidateSchedule, TestStats, parse_test_policy, select_simplest
+from core.result_store import ResultStore, engine_version
+from core.budget import RunBudget, cost_scale, load_deferred, save_deferred
+from core.checkpoint import CheckpointJournal
+from core.sharding import merge_summaries, parse_shard, shard_from_env, shard_path
+from core import conjecture_engine, linalg, rational_conjecture, sequence_view, verification
+from core.sequence_view import SequenceView
+from core.fetcher import BFileFetcher
+from core.pack_cache import PackCache, migrate_json_cache
+from core.target_finder import oeis_session
 from core.reporting import create_pr_for_finding
 
 
@@ -66,16 +83,64 @@ LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
 # Timeout per test in seconds
 TEST_TIMEOUT_SEC = _get_env_int("TEST_TIMEOUT_SEC", 60, min_value=1)
 # <-- MODIFIED: Default list of tests now includes "rat" for rational functions
-ENABLE_TESTS = _get_env_list("ENABLE_TESTS", ["poly", "rec", "exp", "rat"])
+# An optional policy prefix selects how tests are scheduled, e.g. "cascade:poly,exp,rec"
+# (all | cascade | race | simplest; see core/scheduler.py). Default: simplest.
+TEST_POLICY, ENABLE_TESTS = parse_test_policy(_get_env_list("ENABLE_TESTS", ["poly", "rec", "exp", "rat", "hol"]))
+# Measured per-test cost and success rate, carried between runs to order the tests
+SCHEDULER_STATS_PATH = os.path.join("data", "cache", "scheduler_stats.json")
+# Stored results per (sequence, data hash, test, engine version); unchanged units are not re-run
+RESULT_STORE_ENABLED = _get_env_bool("RESULT_STORE_ENABLED", True)
+RESULT_STORE_PATH = os.getenv("RESULT_STORE_PATH", os.path.join("data", "cache", "results.sqlite3"))
+# Wall-clock budget for the whole run; 0 keeps the fixed TEST_TIMEOUT_SEC per test
+RUN_DEADLINE_SEC = _get_env_float("RUN_DEADLINE_SEC", 0.0, min_value=0.0)
+# Upper bound on any one budgeted test, so a single test cannot take the whole remaining
+# budget; 0 means a quarter of RUN_DEADLINE_SEC
+TEST_MAX_TIMEOUT_SEC = _get_env_float("TEST_MAX_TIMEOUT_SEC", 0.0, min_value=0.0)
+# Candidates that did not fit in the budget; the next run analyzes them first
+DEFERRED_PATH = os.path.join("data", "cache", "deferred_candidates.json")
+# Journal of completed candidates, so a run killed by the job timeout can resume
+CHECKPOINT_ENABLED = _get_env_bool("CHECKPOINT_ENABLED", True)
+CHECKPOINT_PATH = os.path.join("data", "cache", "checkpoint.jsonl")
+# Per-run metrics and per-candidate results; sharded runs write one file per shard
+SUMMARY_PATH = os.path.join("data", "results", "analysis_summary.json")
+# Changes whenever a test implementation or the engine configuration changes
+ENGINE_VERSION = engine_version([conjecture_engine, rational_conjecture, linalg, verification, sequence_view],
+                                extra=json.dumps(conjecture_engine.CONFIG, sort_keys=True, default=str))
 # Simple fetch retry policy
 MAX_FETCH_RETRIES = _get_env_int("MAX_FETCH_RETRIES", 3, min_value=1)
 FETCH_RETRY_BASE_SLEEP = _get_env_float("FETCH_RETRY_BASE_SLEEP", 1.0, min_value=0.0)
+# Concurrent b-file downloads: pooled keep-alive connections and a token-bucket rate
+# limit that backs off on 429/503 (see core/fetcher.py)
+FETCH_MAX_CONNECTIONS = _get_env_int("FETCH_MAX_CONNECTIONS", 0, min_value=0)  # 0: PREFETCH_DEPTH
+FETCH_RATE_PER_SEC = _get_env_float("FETCH_RATE_PER_SEC", 3.0, min_value=0.01)
+# b-files are streamed and cut off after this many terms / total digits; 0 disables a cap
+B_FILE_MAX_TERMS = _get_env_int("B_FILE_MAX_TERMS", 10000, min_value=0)
+B_FILE_MAX_DIGITS = _get_env_int("B_FILE_MAX_DIGITS", 1000000, min_value=0)
 # Disk cache controls
 CACHE_ENABLED = _get_env_bool("CACHE_ENABLED", True)
-CACHE_TTL_HOURS = _get_env_int("CACHE_TTL_HOURS", 720, min_value=1)  # default 30 days
-CACHE_DIR = os.path.join("data", "cache", "sequence_data")
+CACHE_TTL_HOURS = _get_env_int("CACHE_TTL_HOURS", 720, min_value=1)  # default 30 days; then revalidate
+CACHE_PATH = os.path.join("data", "cache", "sequences.pack")
+# Byte budget of the sequence cache; least recently used sequences are evicted beyond it (0: unbounded)
+CACHE_MAX_MB = _get_env_int("CACHE_MAX_MB", 1024, min_value=0)
+# Older one-JSON-file-per-sequence cache, migrated into the pack on first use
+LEGACY_CACHE_DIR = os.path.join("data", "cache", "sequence_data")
 # Dry run skips PR creation (logs instead)
 DRY_RUN = _get_env_bool("DRY_RUN", False)
+# b-files fetched ahead of the candidate being analyzed (fetch-stage threads)
+PREFETCH_DEPTH = _get_env_int("PREFETCH_DEPTH", 4, min_value=1)
+# Sandbox worker processes for candidate×test units; 0 means one per enabled test
+ANALYZER_WORKERS = _get_env_int("ANALYZER_WORKERS", 0, min_value=0)
+# Run tests in killable worker subprocesses; off falls back to in-process threads
+SANDBOX_ENABLED = _get_env_bool("SANDBOX_ENABLED", True)
+# Per-test CPU-time cap (RLIMIT_CPU) and per-worker address-space cap (RLIMIT_AS); 0 disables.
+# The CPU cap is raised for any test whose (budgeted) timeout is longer.
+TEST_CPU_LIMIT_SEC = _get_env_int("TEST_CPU_LIMIT_SEC", TEST_TIMEOUT_SEC, min_value=0)
+TEST_MEMORY_LIMIT_MB = _get_env_int("TEST_MEMORY_LIMIT_MB", 4096, min_value=0)
+
+B_FILE_FETCHER = BFileFetcher(oeis_session, max_connections=FETCH_MAX_CONNECTIONS or PREFETCH_DEPTH,
+                              rate_per_sec=FETCH_RATE_PER_SEC, max_retries=MAX_FETCH_RETRIES,
+                              retry_base_sleep=FETCH_RETRY_BASE_SLEEP, max_terms=B_FILE_MAX_TERMS or None,
+                              max_digits=B_FILE_MAX_DIGITS or None)
 
 
 # -------------------------
@@ -116,62 +181,107 @@ def is_valid_oeis_id(s: str) -> bool:
     # Accepts standard OEIS IDs like A000045, allow any digit length after A
     return bool(re.fullmatch(r"A\d{3,}", s.strip()))
 
-def cache_path_for(oeis_id: str) -> str:
-    return os.path.join(CACHE_DIR, f"{oeis_id}.json")
+# The sequence cache; opened by main() (None while closed or disabled).
+SEQUENCE_CACHE: Optional[PackCache] = None
 
-def load_from_cache(oeis_id: str) -> Optional[Any]:
+def open_sequence_cache() -> Optional[PackCache]:
     if not CACHE_ENABLED:
         return None
-    path = cache_path_for(oeis_id)
-    if not os.path.exists(path):
+    try:
+        cache = PackCache(CACHE_PATH, max_bytes=CACHE_MAX_MB * 1024 * 1024 or None)
+        migrate_json_cache(cache, LEGACY_CACHE_DIR)
+        return cache
+    except Exception as e:
+        logging.error("Could not open the sequence cache %s: %s", CACHE_PATH, e)
+        return None
+
+def load_from_cache(oeis_id: str) -> Optional[Dict[str, Any]]:
+    """
+    The cached entry {"terms", "offset", "etag", "last_modified", "fresh"}, or None.
+    "terms" is the array read from the pack, not a list.
+
+    Entries stay usable after CACHE_TTL_HOURS; "fresh" only says whether they must be
+    revalidated first.
+    """
+    if SEQUENCE_CACHE is None:
         return None
     try:
-        mtime = datetime.fromtimestamp(os.path.getmtime(path))
-        if datetime.now() - mtime > timedelta(hours=CACHE_TTL_HOURS):
-            return None
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        entry = SEQUENCE_CACHE.get(oeis_id)
     except Exception as e:
         logging.debug("Cache load failed for %s: %s", oeis_id, e)
         return None
+    if entry is None or not len(entry.terms):
+        return None
+    age = datetime.now() - datetime.fromtimestamp(entry.stored_at)
+    return dict(entry._asdict(), fresh=age <= timedelta(hours=CACHE_TTL_HOURS))
 
-def save_to_cache(oeis_id: str, data: Any) -> None:
-    if not CACHE_ENABLED:
+def save_to_cache(oeis_id: str, data: Any, etag: Optional[str] = None, last_modified: Optional[str] = None,
+                  offset: Optional[int] = None) -> None:
+    if SEQUENCE_CACHE is None:
         return
     try:
-        ensure_dir(CACHE_DIR)
-        with open(cache_path_for(oeis_id), "w", encoding="utf-8") as f:
-            json.dump(data, f)
+        SEQUENCE_CACHE.put(oeis_id, data, offset, etag, last_modified)
     except Exception as e:
         logging.debug("Cache save failed for %s: %s", oeis_id, e)
 
+def touch_cache(oeis_id: str) -> None:
+    """Restarts the TTL of a cached entry that the server confirmed unchanged."""
+    if SEQUENCE_CACHE is not None:
+        SEQUENCE_CACHE.touch(oeis_id)
+
 def fetch_sequence_data_with_retries(oeis_id: str) -> Optional[Any]:
     # Use cache first
     cached = load_from_cache(oeis_id)
-    if cached is not None:
+    if cached is not None and cached["fresh"]:
         logging.info("Loaded %s from cache.", oeis_id)
-        return cached
+        return cached["terms"]
+
+    # Fetch through the shared rate-limited fetcher (it retries transient failures). Past the
+    # TTL this is a conditional GET, and an unchanged b-file answers 304.
+    b_file = B_FILE_FETCHER.fetch_b_file(oeis_id, etag=cached and cached.get("etag"),
+                                         last_modified=cached and cached.get("last_modified"))
+    if b_file is not None and b_file.not_modified and cached is not None:
+        touch_cache(oeis_id)
+        logging.info("Revalidated %s: unchanged (HTTP 304), using the cached copy.", oeis_id)
+        return cached["terms"]
+    if b_file is not None and b_file.terms:
+        save_to_cache(oeis_id, b_file.terms, b_file.etag, b_file.last_modified, b_file.offset)
+        return b_file.terms
+    if cached is not None:
+        logging.warning("Could not revalidate %s; using the stale cached copy.", oeis_id)
+        return cached["terms"]
+    return None
+
+
+def prefetch_sequences(oeis_ids: List[str], depth: int) -> Iterator[Tuple[str, Optional[Any]]]:
+    """
+    Fetch stage: yields (oeis_id, data) in input order while fetching up to `depth` ahead.
 
-    # Fetch with retries
-    last_err = None
-    for attempt in range(1, MAX_FETCH_RETRIES + 1):
+    Fetches (including their retry sleeps) run in background threads, so network
+    latency overlaps with the analysis of earlier candidates.
+    """
+    ids = iter(oeis_ids)
+    ahead: Deque[Tuple[str, Future]] = deque()
+    with ThreadPoolExecutor(max_workers=depth, thread_name_prefix="fetch") as ex:
         try:
-            data = fetch_b_file_data(oeis_id)
-            if data:
-                save_to_cache(oeis_id, data)
-                return data
-            else:
-                last_err = RuntimeError("Empty or falsy data returned")
-        except Exception as e:
-            last_err = e
-        sleep_s = FETCH_RETRY_BASE_SLEEP * (2 ** (attempt - 1))
-        logging.warning("Fetch attempt %d/%d for %s failed: %s. Retrying in %.1fs",
-                        attempt, MAX_FETCH_RETRIES, oeis_id, last_err, sleep_s)
-        time.sleep(sleep_s)
-
-    logging.error("Failed to fetch data for %s after %d attempts. Last error: %s",
-                  oeis_id, MAX_FETCH_RETRIES, last_err)
-    return None
+            for oeis_id in ids:
+                ahead.append((oeis_id, ex.submit(fetch_sequence_data_with_retries, oeis_id)))
+                if len(ahead) >= depth:
+                    break
+            while ahead:
+                oeis_id, fut = ahead.popleft()
+                next_id = next(ids, None)
+                if next_id is not None:
+                    ahead.append((next_id, ex.submit(fetch_sequence_data_with_retries, next_id)))
+                try:
+                    data = fut.result()
+                except Exception:
+                    logging.error("Fetch for %s raised: %s", oeis_id, traceback.format_exc())
+                    data = None
+                yield oeis_id, data
+        finally:
+            for _, fut in ahead:
+                fut.cancel()
 
 
 # -------------------------
@@ -189,10 +299,24 @@ def get_test_callable(name: str):
     # <-- ADDED: Logic for rational function test
     if key in ("rat", "rational", "rational_function"):
         return "rational_function", test_rational_conjecture
+    if key in ("hol", "holonomic", "prec", "dfinite"):
+        return "holonomic_recurrence", test_holonomic_conjecture
+    if key in ("gf", "pade", "rational_gf"):
+        return "rational_generating_function", test_rational_gf_conjecture
     return None, None
 
-def run_test_with_timeout(label: str, fn, sequence_data: Any, timeout_sec: int) -> Dict[str, Any]:
+def bind_test(label: str, fn, oeis_id: str):
+    """Adapts a test to the standard fn(sequence_data) signature."""
+    # The rational test needs the oeis_id for logging. A partial (rather than a
+    # lambda closing over loop variables) binds the right fn and id per iteration.
+    if label == "rational_function":
+        return functools.partial(fn, oeis_id=oeis_id)
+    return fn
+
+def run_test_with_timeout(label: str, fn, sequence_data: Any, timeout_sec: float) -> Dict[str, Any]:
     # Run test in separate thread to allow timeout; return a result dict even on error
+    if timeout_sec <= 0:
+        return {"status": "deferred"}
     def _invoke():
         return fn(sequence_data)
 
@@ -205,27 +329,218 @@ def run_test_with_timeout(label: str, fn, sequence_data: Any, timeout_sec: int)
                 return {"status": "error", "error": f"{label} returned non-dict", "raw": str(result)}
             return result
         except TimeoutError:
-            return {"status": "error", "error": f"{label} timed out after {timeout_sec}s"}
+            return {"status": "error", "error": f"{label} timed out after {round(timeout_sec, 1):g}s"}
         except Exception:
             return {"status": "error", "error": f"{label} raised exception", "trace": traceback.format_exc()}
 
 
+def analyze_sequence(oeis_id: str, view: SequenceView, tests_plan,
+                     known: Optional[Dict[str, Dict[str, Any]]] = None,
+                     timeout: Union[float, Callable[[str], float]] = TEST_TIMEOUT_SEC) -> Dict[str, Dict[str, Any]]:
+    """
+    Runs the enabled tests without a known result on one sequence concurrently in threads of this process.
+
+    Only used with SANDBOX_ENABLED=0: a timed-out thread cannot be stopped and keeps running,
+    and the test policy can only be applied to the finished results. `timeout` is fixed or a
+    function of the label (the run budget's), evaluated when the tests start.
+    """
+    results: Dict[str, Dict[str, Any]] = dict(known or {})
+    tests_plan = [t for t in tests_plan if t[1] not in results]
+    if not tests_plan:
+        return results
+    with ThreadPoolExecutor(max_workers=len(tests_plan)) as ex:
+        futures = {}
+        for t_key, label, fn in tests_plan:
+            timeout_sec = timeout(label) if callable(timeout) else timeout
+            futures[ex.submit(run_test_with_timeout, label, bind_test(label, fn, oeis_id), view, timeout_sec)] = (t_key, label)
+
+        for fut in as_completed(futures):
+            t_key, label = futures[fut]
+            try:
+                res = fut.result()
+            except Exception:
+                res = {"status": "error", "error": f"{label} future raised", "trace": traceback.format_exc()}
+            results[label] = res
+    return results
+
+def tally_results(totals: Dict[str, Any], results: Dict[str, Dict[str, Any]]) -> None:
+    """Adds one processed candidate's results to the run metrics."""
+    for label, res in results.items():
+        status = res.get("status")
+        if status == "verified" and res.get("cached"):
+            totals["verified_stored"] += 1
+        elif status == "verified":
+            totals["verified_total"] += 1
+            totals["verified_by_test"][label] = totals["verified_by_test"].get(label, 0) + 1
+        elif status == "error":
+            totals["errors_by_test"][label] = totals["errors_by_test"].get(label, 0) + 1
+    totals["candidates_processed"] += 1
+
+def report_candidate(oeis_id: str, sequence_data: SequenceView, results: Dict[str, Dict[str, Any]],
+                     tests_plan, totals: Dict[str, Any], per_seq_start: float) -> None:
+    """Logs, counts and (unless DRY_RUN) opens PRs for one candidate's results."""
+    any_verified = False
+    results = {label: results.get(label, {"status": "error", "error": "missing result"}) for _, label, _ in tests_plan}
+    tally_results(totals, results)
+
+    # Report outcomes in deterministic original order
+    for _, label, _ in tests_plan:
+        res = results[label]
+        status = res.get("status")
+        if status == "verified" and res.get("cached"):
+            # Reported (and its PR opened) by the run that computed it.
+            logging.info("[%s] Verified conjecture for %s (stored result; no new PR).", label, oeis_id)
+            any_verified = True
+        elif status == "verified":
+            logging.info("[%s] Verified conjecture for %s.", label, oeis_id)
+            if DRY_RUN:
+                logging.info("DRY_RUN=1 -> skipping PR creation for %s (%s).", oeis_id, label)
+            else:
+                try:
+                    create_pr_for_finding(oeis_id, res, sequence_data)
+                except Exception:
+                    logging.error("Failed to create PR for %s (%s): %s", oeis_id, label, traceback.format_exc())
+            any_verified = True
+        elif status == "superseded":
+            logging.info("[%s] Also verified for %s; superseded by the simpler %s formula.", label, oeis_id, res.get("by"))
+        elif status in ("skipped", "cancelled", "deferred"):
+            default_reason = "cancelled after another test verified" if status == "cancelled" else "run deadline reached"
+            logging.info("Skipped %s test for %s (%s).", label.replace("_", " "), oeis_id,
+                         res.get("reason", default_reason))
+        elif status == "error":
+            err_msg = res.get("error", "unknown error")
+            logging.info("No %s result for %s (error: %s).", label, oeis_id, err_msg)
+            if "trace" in res:
+                logging.debug("Trace for %s %s:\n%s", oeis_id, label, res["trace"])
+        else:
+            # status like "unverified", "no_match", etc.
+            logging.info("No simple %s found for %s.", label.replace("_", " "), oeis_id)
+
+    per_seq_elapsed = time.time() - per_seq_start
+    if any_verified:
+        logging.info("--- Finished analysis for %s (new findings created). [%.2fs] ---", oeis_id, per_seq_elapsed)
+    else:
+        logging.info("--- Finished analysis for %s (no conjectures verified). [%.2fs] ---", oeis_id, per_seq_elapsed)
+
+
+def summarize_results(oeis_id: str, data_hash: str, results: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """A candidate's results for the summary file, without traces or raw payloads."""
+    keep = ("status", "type", "formula_latex", "details", "error", "by", "reason", "cached", "elapsed_sec")
+    return {"oeis_id": oeis_id, "data_hash": data_hash,
+            "results": {lbl: {k: v for k, v in res.items() if k in keep} for lbl, res in results.items()}}
+
+def write_summary(path: str, summary: Dict[str, Any]) -> None:
+    ensure_dir(os.path.dirname(path))
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, default=str)
+        logging.info("Wrote run summary to %s.", path)
+    except Exception as e:
+        logging.error("Could not write run summary to %s: %s", path, e)
+
+def report_stage(report_queue: "queue.Queue", tests_plan, totals: Dict[str, Any],
+                 result_store: Optional[ResultStore], records: List[Dict[str, Any]],
+                 journal: Optional[CheckpointJournal], deferred_ids: List[str]) -> None:
+    """
+    Report stage: takes (oeis_id, view, data_hash, started, gather) items in candidate order until None.
+
+    gather() blocks until that candidate's results are ready and returns them, so PR
+    creation runs here instead of holding up fetching and test submission. Fresh
+    results are written to the result store before the test policy picks what to report.
+    A candidate whose tests hit the run deadline before starting is deferred instead,
+    unless it already produced a new finding.
+    """
+    while True:
+        item = report_queue.get()
+        if item is None:
+            return
+        oeis_id, sequence_data, data_hash, started, gather = item
+        try:
+            results = gather()
+            if result_store is not None:
+                result_store.save(oeis_id, data_hash, results)
+            deferred = any(res.get("status") == "deferred" for res in results.values())
+            found = any(res.get("status") == "verified" and not res.get("cached") for res in results.values())
+            if deferred and not found:
+                logging.info("Deferring %s: the run deadline passed before all of its tests started.", oeis_id)
+                deferred_ids.append(oeis_id)
+                continue
+            results = select_simplest(results, TEST_POLICY)
+            report_candidate(oeis_id, sequence_data, results, tests_plan, totals, started)
+            record = summarize_results(oeis_id, data_hash, results)
+            records.append(record)
+            if journal is not None:
+                journal.append(record)
+        except Exception:
+            logging.error("Reporting failed for %s: %s", oeis_id, traceback.format_exc())
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Analyze candidate OEIS sequences for conjectures.")
+    parser.add_argument("--workers", type=int, default=ANALYZER_WORKERS,
+                        help="Sandbox worker processes for candidate×test units "
+                             "(default: env ANALYZER_WORKERS, or one per enabled test).")
+    parser.add_argument("--shard", default=shard_from_env(), metavar="i/N",
+                        help="Analyze only shard i (0-based) of N, partitioned by a stable hash of the "
+                             "OEIS id (default: env SHARD_INDEX/SHARD_COUNT, else everything).")
+    parser.add_argument("--merge", nargs="+", metavar="SUMMARY",
+                        help="Merge per-shard summary files into %s instead of analyzing." % SUMMARY_PATH)
+    return parser.parse_args(argv)
+
+
 # -------------------------
 # Main
 # -------------------------
 
-def main():
+def main(argv: Optional[List[str]] = None):
     """
     Main orchestrator to analyze candidate sequences for conjectures.
 
+    Every candidate is fetched on every run, but a test is only re-run when the b-file
+    or the engine changed since its result was stored.
+
     Improvements:
-    - Optional disk cache for fetched sequence data with TTL (env: CACHE_ENABLED, CACHE_TTL_HOURS)
+    - Optional disk cache for fetched sequence data in one binary pack file; after the TTL an entry
+      is revalidated with a conditional GET (ETag / Last-Modified) instead of re-downloaded, and
+      least recently used sequences are evicted beyond a byte budget (env: CACHE_ENABLED,
+      CACHE_TTL_HOURS, CACHE_MAX_MB)
     - Fetch retries with backoff (env: MAX_FETCH_RETRIES, FETCH_RETRY_BASE_SLEEP)
+    - Streaming b-file parsing that stops at a term / digit cap (env: B_FILE_MAX_TERMS, B_FILE_MAX_DIGITS)
+    - Concurrent b-file fetches over pooled keep-alive connections, rate-limited with a token
+      bucket that backs off on 429/503 and Retry-After (env: FETCH_MAX_CONNECTIONS, FETCH_RATE_PER_SEC)
+    - Pipelined fetch → analyze → report stages with bounded queues; the next b-files are
+      prefetched while earlier candidates are analyzed (env: PREFETCH_DEPTH)
     - Per-test timeouts and exception isolation (env: TEST_TIMEOUT_SEC)
+    - Tests run in reusable worker subprocesses that are killed at the deadline, with CPU-time
+      and memory caps (env: SANDBOX_ENABLED, TEST_CPU_LIMIT_SEC, TEST_MEMORY_LIMIT_MB)
     - Run tests concurrently per sequence while preserving reporting order (env: ENABLE_TESTS)
+    - Persistent SQLite result store keyed by sequence, data hash, test and engine version
+      (env: RESULT_STORE_ENABLED, RESULT_STORE_PATH)
+    - Cost-aware test scheduling that stops or cancels work once a formula is verified and
+      keeps one formula per candidate (policy prefix in ENABLE_TESTS, e.g. "cascade:poly,rec")
     - Optional dry-run that skips PR creation (env: DRY_RUN)
+    - Sandbox workers shared across candidates with deterministic reporting (--workers / env: ANALYZER_WORKERS)
+    - Run-wide time budget: per-test timeouts from predicted cost, and candidates that do
+      not fit are deferred to the front of the next run (env: RUN_DEADLINE_SEC, TEST_MAX_TIMEOUT_SEC)
+    - Checkpoint journal of completed candidates; a killed run resumes where it stopped
+      (env: CHECKPOINT_ENABLED)
+    - Static sharding across independent runners, each writing a mergeable summary file
+      (--shard i/N / env: SHARD_INDEX, SHARD_COUNT; combine with --merge)
     """
+    args = parse_args(argv)
     setup_logging()
+
+    if args.merge:
+        merged = merge_summaries(args.merge)
+        write_summary(SUMMARY_PATH, merged)
+        logging.info("Merged %d summaries covering %d candidates.", len(args.merge), len(merged["candidates"]))
+        return
+
+    try:
+        shard = parse_shard(args.shard)
+    except ValueError as e:
+        logging.error("%s", e)
+        return
     run_id = f"run-{int(time.time())}"
     logging.info("Starting main analyzer (processing all candidates every run)... run_id=%s", run_id)
 
@@ -269,6 +584,19 @@ def main():
     logging.info("Loaded %d candidate sequences from %s (%d after validation/dedup).",
                  len(candidate_ids), candidates_path, len(normalized_ids))
 
+    if shard is not None:
+        normalized_ids = shard.filter(normalized_ids)
+        logging.info("Shard %s: analyzing %d of these candidates.", shard.label, len(normalized_ids))
+
+    # Candidates deferred by the previous run go first
+    deferred_path = shard_path(DEFERRED_PATH, shard)
+    listed = set(normalized_ids)
+    carried = [oeis_id for oeis_id in load_deferred(deferred_path) if oeis_id in listed]
+    if carried:
+        first = set(carried)
+        normalized_ids = carried + [oeis_id for oeis_id in normalized_ids if oeis_id not in first]
+        logging.info("Analyzing %d candidates deferred by the previous run first.", len(carried))
+
     # Determine tests to run and stable reporting order
     tests_plan = []
     for t in ENABLE_TESTS:
@@ -286,94 +614,171 @@ def main():
         "fetch_success": 0,
         "fetch_failed": 0,
         "verified_total": 0,
+        "verified_stored": 0,
+        "deferred": 0,
         "verified_by_test": {lbl: 0 for _, lbl, _ in tests_plan},
         "errors_by_test": {lbl: 0 for _, lbl, _ in tests_plan},
     }
     t_start = time.time()
 
-    # --- Process Each Candidate ---
-    for oeis_id in normalized_ids:
-        logging.info("--- Analyzing sequence: %s ---", oeis_id)
-        per_seq_start = time.time()
-
-        sequence_data = fetch_sequence_data_with_retries(oeis_id)
-        if not sequence_data:
-            logging.warning("Could not fetch data for %s. Skipping.", oeis_id)
-            totals["fetch_failed"] += 1
-            continue
+    # --- Resume from the checkpoint journal ---
+    records: List[Dict[str, Any]] = []
+    journal = None
+    if CHECKPOINT_ENABLED:
+        run_key = "|".join([shard.label if shard else "all", ENGINE_VERSION, TEST_POLICY,
+                            ",".join(lbl for _, lbl, _ in tests_plan)])
+        journal = CheckpointJournal(shard_path(CHECKPOINT_PATH, shard), run_key)
+        for record in journal.records(normalized_ids):
+            totals["fetch_success"] += 1
+            tally_results(totals, record["results"])
+            records.append(record)
+        normalized_ids = [oeis_id for oeis_id in normalized_ids if oeis_id not in journal]
 
-        totals["fetch_success"] += 1
-
-        # Run all enabled tests concurrently per sequence
-        results: Dict[str, Dict[str, Any]] = {}
-        with ThreadPoolExecutor(max_workers=len(tests_plan)) as ex:
-            futures = {}
-            for t_key, label, fn in tests_plan:
-                # <-- MODIFIED: Handle the specific signature for the rational test
-                # The rational test needs the oeis_id for logging, so we wrap it
-                # in a lambda to match the standard fn(sequence_data) signature.
-                if label == "rational_function":
-                    callable_fn = lambda data: fn(data, oeis_id)
-                else:
-                    callable_fn = fn
-                
-                futures[ex.submit(run_test_with_timeout, label, callable_fn, sequence_data, TEST_TIMEOUT_SEC)] = (t_key, label)
-
-            for fut in as_completed(futures):
-                t_key, label = futures[fut]
-                try:
-                    res = fut.result()
-                except Exception:
-                    res = {"status": "error", "error": f"{label} future raised", "trace": traceback.format_exc()}
-                results[label] = res
-
-        any_verified = False
-
-        # Report outcomes in deterministic original order
-        for _, label, _ in tests_plan:
-            res = results.get(label, {"status": "error", "error": "missing result"})
-            status = res.get("status")
-            if status == "verified":
-                totals["verified_total"] += 1
-                totals["verified_by_test"][label] = totals["verified_by_test"].get(label, 0) + 1
-                logging.info("[%s] Verified conjecture for %s.", label, oeis_id)
-                if DRY_RUN:
-                    logging.info("DRY_RUN=1 -> skipping PR creation for %s (%s).", oeis_id, label)
-                else:
-                    try:
-                        create_pr_for_finding(oeis_id, res, sequence_data)
-                    except Exception:
-                        logging.error("Failed to create PR for %s (%s): %s", oeis_id, label, traceback.format_exc())
-                any_verified = True
-            elif status == "error":
-                totals["errors_by_test"][label] = totals["errors_by_test"].get(label, 0) + 1
-                err_msg = res.get("error", "unknown error")
-                logging.info("No %s result for %s (error: %s).", label, oeis_id, err_msg)
-                if "trace" in res:
-                    logging.debug("Trace for %s %s:\n%s", oeis_id, label, res["trace"])
+    # --- Process Each Candidate ---
+    # Three stages: prefetch threads fetch b-files ahead, this thread submits
+    # candidate×test units to the sandbox workers, and a reporter thread reports
+    # results strictly in candidate order. The bounded report queue applies
+    # backpressure so at most a few candidates are in flight.
+    workers = args.workers if args.workers > 0 else len(tests_plan)
+    test_stats = TestStats(SCHEDULER_STATS_PATH if CACHE_ENABLED else None)
+    logging.info("Test policy: %s; order: %s", TEST_POLICY,
+                 ", ".join(test_stats.order([lbl for _, lbl, _ in tests_plan], TEST_POLICY)))
+    budget = None
+    if RUN_DEADLINE_SEC > 0:
+        budget = RunBudget(RUN_DEADLINE_SEC, workers, len(normalized_ids), test_stats,
+                           max_timeout_sec=TEST_MAX_TIMEOUT_SEC or RUN_DEADLINE_SEC / 4)
+        logging.info("Run budget: %.0fs for %d candidates on %d workers.", RUN_DEADLINE_SEC,
+                     len(normalized_ids), workers)
+    deferred_ids: List[str] = []
+    sandbox = None
+    if SANDBOX_ENABLED:
+        # Workers re-import this module; the heavy imports are preloaded once in the fork
+        # server instead (not core.target_finder, whose import warms up an OEIS session).
+        sandbox = TestSandbox(workers, cpu_limit_sec=TEST_CPU_LIMIT_SEC or None,
+                              memory_limit_mb=TEST_MEMORY_LIMIT_MB or None,
+                              preload=["core.conjecture_engine", "core.rational_conjecture", "requests"])
+    report_queue: "queue.Queue[Optional[Tuple[str, SequenceView, str, float, Callable[[], Dict[str, Dict[str, Any]]]]]]" = \
+        queue.Queue(maxsize=2 * workers)
+    result_store = ResultStore(RESULT_STORE_PATH, ENGINE_VERSION) if RESULT_STORE_ENABLED else None
+    reporter = threading.Thread(target=report_stage,
+                                args=(report_queue, tests_plan, totals, result_store, records, journal, deferred_ids),
+                                name="report", daemon=True)
+    reporter.start()
+    global SEQUENCE_CACHE
+    SEQUENCE_CACHE = open_sequence_cache()
+    try:
+        for position, (oeis_id, sequence_data) in enumerate(prefetch_sequences(normalized_ids, PREFETCH_DEPTH)):
+            if budget is not None and budget.exhausted():
+                deferred_ids.extend(normalized_ids[position:])
+                logging.warning("Run deadline reached; deferring the remaining %d candidates.",
+                                len(normalized_ids) - position)
+                break
+            logging.info("--- Analyzing sequence: %s ---", oeis_id)
+            per_seq_start = time.time()
+
+            if sequence_data is None or not len(sequence_data):
+                logging.warning("Could not fetch data for %s. Skipping.", oeis_id)
+                totals["fetch_failed"] += 1
+                continue
+
+            totals["fetch_success"] += 1
+
+            # Build the shared view once; every test reuses its arrays and caches. A cached
+            # sequence arrives as an array and is wrapped without a copy.
+            view = SequenceView(sequence_data, oeis_id)
+
+            known = {}
+            if result_store is not None:
+                known = result_store.lookup(oeis_id, view.content_hash, [lbl for _, lbl, _ in tests_plan])
+
+            timeout: Union[float, Callable[[str], float]] = TEST_TIMEOUT_SEC
+            if budget is not None:
+                if not budget.admit(view, [lbl for _, lbl, _ in tests_plan if lbl not in known]):
+                    logging.info("Deferring %s: its predicted cost exceeds the remaining budget.", oeis_id)
+                    deferred_ids.append(oeis_id)
+                    continue
+                timeout = functools.partial(budget.timeout_for, view=view)
+
+            if sandbox is None:
+                # Without the sandbox the reporter runs the in-process analysis itself.
+                gather = functools.partial(analyze_sequence, oeis_id, view, tests_plan, known, timeout)
             else:
-                # status like "unverified", "no_match", etc.
-                logging.info("No simple %s found for %s.", label.replace("_", " "), oeis_id)
-
-        totals["candidates_processed"] += 1
-        per_seq_elapsed = time.time() - per_seq_start
-        if any_verified:
-            logging.info("--- Finished analysis for %s (new findings created). [%.2fs] ---", oeis_id, per_seq_elapsed)
-        else:
-            logging.info("--- Finished analysis for %s (no conjectures verified). [%.2fs] ---", oeis_id, per_seq_elapsed)
+                plan = [(label, bind_test(label, fn, oeis_id)) for _, label, fn in tests_plan]
+                schedule = CandidateSchedule(sandbox, TEST_POLICY, plan, (view,), timeout, test_stats, known,
+                                             cost_scale(view))
+                gather = schedule.start().wait
+            report_queue.put((oeis_id, view, view.content_hash, per_seq_start, gather))
+    finally:
+        report_queue.put(None)
+        reporter.join()
+        if sandbox is not None:
+            sandbox.close()
+        test_stats.save()
+        if result_store is not None:
+            result_store.close()
+        if journal is not None:
+            journal.close()
+        if SEQUENCE_CACHE is not None:
+            SEQUENCE_CACHE.close()
+            totals["sequence_cache"] = dict(SEQUENCE_CACHE.stats, entries=len(SEQUENCE_CACHE),
+                                            size_bytes=SEQUENCE_CACHE.size_bytes)
+            SEQUENCE_CACHE = None
+
+    # The reporter and this loop both defer candidates; keep the list in candidate order
+    # so the next run retries them deterministically.
+    rank = {oeis_id: i for i, oeis_id in enumerate(normalized_ids)}
+    deferred_ids.sort(key=rank.__getitem__)
+    totals["deferred"] = len(deferred_ids)
+    totals["fetch_http"] = dict(B_FILE_FETCHER.stats)
+    save_deferred(deferred_path, deferred_ids)
+
+    # Reached only when every candidate was handled; a killed run keeps its journal.
+    if journal is not None:
+        journal.complete()
 
     # Summary
     elapsed = time.time() - t_start
     logging.info("Main analyzer has completed its run. run_id=%s", run_id)
-    logging.info("Summary: processed %d/%d candidates in %.2fs; fetch ok=%d, fetch failed=%d, verified=%d",
+    logging.info("Summary: processed %d/%d candidates in %.2fs; fetch ok=%d, fetch failed=%d, verified=%d "
+                 "(plus %d from stored results)",
                  totals["candidates_processed"], totals["candidates_total"], elapsed,
-                 totals["fetch_success"], totals["fetch_failed"], totals["verified_total"])
+                 totals["fetch_success"], totals["fetch_failed"], totals["verified_total"], totals["verified_stored"])
+    if deferred_ids:
+        logging.info("  Deferred to the next run: %s", ", ".join(deferred_ids))
     for lbl, cnt in totals["verified_by_test"].items():
         if cnt > 0: # Only show tests that found something
             logging.info("  Verified by %-20s: %d", lbl, cnt)
     for lbl, cnt in totals["errors_by_test"].items():
         if cnt:
             logging.info("  Errors in %-22s: %d", lbl, cnt)
+    if B_FILE_FETCHER.stats["requests"]:
+        logging.info("Fetcher: %d requests (%d not modified), %d throttled, %d retries, %d without a b-file, "
+                     "%d failed; rate limit ended at %.2f/s.", B_FILE_FETCHER.stats["requests"],
+                     B_FILE_FETCHER.stats["not_modified"], B_FILE_FETCHER.stats["throttled"], B_FILE_FETCHER.stats["retries"],
+                     B_FILE_FETCHER.stats["not_found"], B_FILE_FETCHER.stats["failed"], B_FILE_FETCHER.limiter.rate)
+    if "sequence_cache" in totals:
+        cache_stats = totals["sequence_cache"]
+        logging.info("Sequence cache: %d hits, %d misses, %d evicted, %d compactions; %d entries in %.1f MB.",
+                     cache_stats["hits"], cache_stats["misses"], cache_stats["evictions"],
+                     cache_stats["compactions"], cache_stats["entries"], cache_stats["size_bytes"] / 1e6)
+    if result_store is not None:
+        logging.info("Result store (engine %s): %d hits, %d misses, %d results saved.",
+                     ENGINE_VERSION, result_store.hits, result_store.misses, result_store.saved)
+    if sandbox is not None:
+        logging.info("Sandbox: %d tests on %d workers; %d killed at the deadline, %d worker crashes, "
+                     "%d cancelled, %d not started before the run deadline.",
+                     sandbox.stats["tasks"], workers, sandbox.stats["timeouts"], sandbox.stats["crashes"],
+                     sandbox.stats["cancelled"], sandbox.stats["deferred"])
+
+    write_summary(shard_path(SUMMARY_PATH, shard), {
+        "shard": shard.label if shard else None,
+        "run_id": run_id,
+        "engine_version": ENGINE_VERSION,
+        "elapsed_sec": elapsed,
+        "metrics": totals,
+        "deferred": deferred_ids,
+        "candidates": records,
+    })
 
 
 if __name__ == "__main__":
@@ -1,9 +1,15 @@
 # src/run_target_finder.py
 
+import argparse
 import json
 import os
 import logging
 from datetime import datetime
+from typing import Dict, List, Optional
+
+from core.sharding import Shard, parse_shard, shard_from_env
+
+DUMP_PATH = os.getenv("OEIS_DUMP_PATH", os.path.join("data", "cache", "oeis_dump.sqlite3"))
 
 # Important: Import happens AFTER logging is configured in main()
 # to ensure module-level code in target_finder also gets logged.
@@ -25,47 +31,36 @@ def setup_runner_logging():
         ]
     )
 
-def find_and_update_candidates():
-    # Now we call the function which will use the pre-configured session
-    from core.target_finder import find_candidate_sequences
-    
-    logging.info("Starting the process to find and update candidate OEIS sequences...")
-    output_dir = "data"
-    output_path = os.path.join(output_dir, "candidate_sequences.json")
-    search_query = "keyword:unkn"
-    num_to_find = 100
+CANDIDATES_PATH = os.path.join("data", "candidate_sequences.json")
+
 
+def load_candidates(path: str = CANDIDATES_PATH) -> List[Dict[str, str]]:
+    """The current candidate list; legacy string entries become {"oeis_id", "comment"} objects."""
     existing_candidates = []
-    existing_ids = set()
     try:
-        if os.path.exists(output_path):
-            with open(output_path, "r", encoding="utf-8") as f:
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
                 loaded_data = json.load(f)
                 for item in loaded_data:
                     if isinstance(item, str):
                         existing_candidates.append({"oeis_id": item, "comment": "Legacy entry."})
-                        existing_ids.add(item)
                     elif isinstance(item, dict) and "oeis_id" in item:
                         existing_candidates.append(item)
-                        existing_ids.add(item["oeis_id"])
-            logging.info(f"Loaded {len(existing_ids)} existing candidates from {output_path}.")
+            logging.info(f"Loaded {len(existing_candidates)} existing candidates from {path}.")
     except (IOError, json.JSONDecodeError) as e:
         logging.warning(f"Could not read existing candidates file. Starting fresh. Error: {e}")
+    return existing_candidates
 
-    logging.info("Searching for new candidate sequences...")
-    new_candidate_ids = find_candidate_sequences(search_query=search_query, count=num_to_find)
 
-    if not new_candidate_ids:
-        logging.info("No new candidate sequences were found in this run.")
-        return
+def add_candidates(new_candidates: Dict[str, str], path: str = CANDIDATES_PATH) -> None:
+    """Appends the new IDs (mapped to their comments) that are not in the list yet, and saves it."""
+    existing_candidates = load_candidates(path)
+    existing_ids = {item["oeis_id"] for item in existing_candidates}
 
     newly_added_count = 0
-    for oeis_id in new_candidate_ids:
+    for oeis_id, comment in new_candidates.items():
         if oeis_id not in existing_ids:
-            existing_candidates.append({
-                "oeis_id": oeis_id,
-                "comment": f"Found via '{search_query}' search on {datetime.now().strftime('%Y-%m-%d')}"
-            })
+            existing_candidates.append({"oeis_id": oeis_id, "comment": comment})
             existing_ids.add(oeis_id)
             newly_added_count += 1
     
@@ -74,19 +69,115 @@ def find_and_update_candidates():
     else:
         logging.info("No new unique candidates were found to add to the list.")
 
-    os.makedirs(output_dir, exist_ok=True)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
     try:
-        with open(output_path, "w", encoding="utf-8") as f:
+        with open(path, "w", encoding="utf-8") as f:
             json.dump(existing_candidates, f, indent=4)
-        logging.info(f"Successfully saved a total of {len(existing_candidates)} candidates to: {output_path}")
+        logging.info(f"Successfully saved a total of {len(existing_candidates)} candidates to: {path}")
     except IOError as e:
         logging.error(f"Error saving updated candidate sequences to file: {e}")
 
 
+def find_and_update_candidates(shard: Optional[Shard] = None, search_queries: Optional[List[str]] = None,
+                               num_to_find: int = 100):
+    # Now we call the function which will use the pre-configured session
+    from core.target_finder import harvest_candidates
+    
+    logging.info("Starting the process to find and update candidate OEIS sequences...")
+    search_queries = search_queries or ["keyword:unkn"]
+    known = {item["oeis_id"] for item in load_candidates()}
+
+    logging.info(f"Searching for up to {num_to_find} new candidate sequences with {len(search_queries)} queries...")
+    # Every shard runs the same search; each keeps only the IDs it will analyze.
+    today = datetime.now().strftime('%Y-%m-%d')
+    new_candidates = {
+        oeis_id: f"Found via '{query}' search on {today}"
+        for oeis_id, query in harvest_candidates(search_queries, num_to_find, known=known,
+                                                 keep=shard.owns if shard is not None else None)
+    }
+
+    if not new_candidates:
+        logging.info("No new candidate sequences were found in this run.")
+        return
+
+    add_candidates(new_candidates)
+
+
+def import_dump(dump_path: str, stripped_path: Optional[str], names_path: Optional[str]) -> None:
+    """Imports a locally downloaded stripped.gz and/or names.gz into the dump store."""
+    from core.oeis_dump import OeisDump
+
+    dump = OeisDump(dump_path)
+    try:
+        if stripped_path:
+            dump.import_stripped(stripped_path)
+        if names_path:
+            dump.import_names(names_path)
+    finally:
+        dump.close()
+
+
+def screen_dump_candidates(dump_path: str, limit: int, shard: Optional[Shard] = None) -> None:
+    """
+    Screens the imported dump with the batched tests and adds up to `limit` passing
+    sequences that are not candidates yet. Their b-files are fetched by the analyzer.
+    """
+    from core.conjecture_engine import CONFIG
+    from core.oeis_dump import OeisDump, screen
+
+    dump = OeisDump(dump_path)
+    try:
+        if not len(dump):
+            logging.error(f"The dump store {dump_path} is empty; import stripped.gz first (--stripped).")
+            return
+        known = {item["oeis_id"] for item in load_candidates()}
+        found: Dict[str, str] = {}
+        today = datetime.now().strftime('%Y-%m-%d')
+        for oeis_id, label, result in screen(dump, min_terms=CONFIG.get('min_sequence_length', 0), exclude=known,
+                                             keep=shard.owns if shard is not None else None):
+            found[oeis_id] = f"Passed the {label} screen of the OEIS dump on {today}: {result.get('details', '')}"
+            if len(found) >= limit:
+                break
+    finally:
+        dump.close()
+
+    if not found:
+        logging.info("No sequences in the dump passed the screen.")
+        return
+    add_candidates(found)
+
+
 def main():
     """Main entry point for finding new target sequences."""
+    parser = argparse.ArgumentParser(description="Find new candidate OEIS sequences.")
+    parser.add_argument("--shard", default=shard_from_env(), metavar="i/N",
+                        help="Keep only new candidates in shard i (0-based) of N "
+                             "(default: env SHARD_INDEX/SHARD_COUNT, else all).")
+    parser.add_argument("--dump", default=DUMP_PATH, metavar="PATH",
+                        help="SQLite store of the imported OEIS dump (default: env OEIS_DUMP_PATH, else %(default)s).")
+    parser.add_argument("--stripped", metavar="FILE",
+                        help="Import a locally downloaded stripped(.gz) dump of the first terms.")
+    parser.add_argument("--names", metavar="FILE", help="Import a locally downloaded names(.gz) dump.")
+    parser.add_argument("--screen", type=int, nargs="?", const=100, default=None, metavar="N",
+                        help="Instead of searching online, add up to N (default 100) sequences from the "
+                             "imported dump that pass the batched polynomial/recurrence screen.")
+    parser.add_argument("--query", action="append", metavar="Q",
+                        help="OEIS search query; repeat to harvest several at once (default: keyword:unkn).")
+    parser.add_argument("--count", type=int, default=100, metavar="N",
+                        help="Add at most N new candidates from the search (default: %(default)s).")
+    args = parser.parse_args()
     setup_runner_logging()
-    find_and_update_candidates()
+    try:
+        shard = parse_shard(args.shard)
+    except ValueError as e:
+        logging.error(str(e))
+        return
+    if args.stripped or args.names:
+        import_dump(args.dump, args.stripped, args.names)
+    if args.screen is not None:
+        screen_dump_candidates(args.dump, args.screen, shard)
+    elif not (args.stripped or args.names):
+        find_and_update_candidates(shard, args.query, args.count)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The analyzer runs with src/ on the path (python src/main_analyzer.py).
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
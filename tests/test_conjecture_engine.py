@@ -0,0 +1,20 @@
+from math import comb
+
+from core.conjecture_engine import test_holonomic_conjecture as holonomic_conjecture
+
+
+def test_holonomic_rejects_kernel_with_shared_factor():
+    # Every p_i of the spurious kernel carried (n-38)(n-39), hiding the failing terms.
+    assert holonomic_conjecture([(i * 7919) % 101 for i in range(60)])["status"] == "failed"
+
+
+def test_holonomic_verifies_catalan_numbers():
+    result = holonomic_conjecture([comb(2 * k, k) // (k + 1) for k in range(60)])
+    assert result["status"] == "verified"
+    assert "order 1" in result["details"]
+
+
+def test_holonomic_reports_undetermined_terms():
+    result = holonomic_conjecture([comb(n, 5) for n in range(60)])
+    assert result["status"] == "verified"
+    assert "n = 6" in result["details"]